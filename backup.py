@@ -0,0 +1,67 @@
+"""Online backup and atomic restore of employees.db.
+
+Backups copy a consistent snapshot through SQLite's backup API while the app
+keeps running; restores are staged, verified and migrated in a temp file and
+then swapped in with os.replace(). backup_zip() and restore_zip() stream
+everything, so their memory use does not grow with the size of the database.
+The page is a different matter: Streamlit keeps the finished zip in memory
+while it serves the download, and keeps an uploaded zip in memory too.
+"""
+import os, shutil, sqlite3, tempfile, zipfile
+import db, migrations
+
+ARCNAME = "employees.db"
+CHUNK = 1 << 20
+
+def snapshot(dst_path):
+    """Consistent copy of the live DB at `dst_path` (writers are not blocked under WAL)."""
+    dst = sqlite3.connect(dst_path)
+    try:
+        with db.conn() as c: c.backup(dst)
+        dst.execute("PRAGMA journal_mode=DELETE")   # self-contained file, no -wal
+    finally:
+        dst.close()
+
+def backup_zip(dir=None):
+    """Snapshot the DB and deflate it into a temp zip in `dir`; returns the zip path."""
+    tmp = tempfile.mkdtemp(dir=dir)
+    try:
+        snap = os.path.join(tmp, ARCNAME); snapshot(snap)
+        fd, path = tempfile.mkstemp(suffix=".zip", dir=dir); os.close(fd)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            zf.write(snap, arcname=ARCNAME)   # read and compressed in chunks
+        return path
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def restore_zip(fileobj):
+    """Replace the live DB with the employees.db inside the zip `fileobj`.
+
+    Raises ValueError when the archive or the database in it is not usable;
+    the live DB is left untouched in that case.
+    """
+    target = os.path.abspath(db.DB)
+    # Stage next to the target so the final os.replace() is an atomic rename.
+    fd, staged = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(target)); os.close(fd)
+    try:
+        with tempfile.TemporaryFile() as up:
+            shutil.copyfileobj(fileobj, up, CHUNK); up.seek(0)
+            try: zf = zipfile.ZipFile(up)
+            except zipfile.BadZipFile: raise ValueError("El archivo no es un ZIP válido")
+            with zf:
+                if ARCNAME not in zf.namelist(): raise ValueError("El ZIP no contiene employees.db")
+                with zf.open(ARCNAME) as src, open(staged, "wb") as dst: shutil.copyfileobj(src, dst, CHUNK)
+        c = sqlite3.connect(staged)
+        try:
+            try: ok = c.execute("PRAGMA integrity_check").fetchone()[0]
+            except sqlite3.DatabaseError as e: raise ValueError(f"employees.db no es una base SQLite válida: {e}")
+            if ok != "ok": raise ValueError(f"integrity_check: {ok}")
+            migrations.migrate(c)
+            c.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            c.close()
+        with db.exclusive():
+            db.remove_sidecars(target)
+            os.replace(staged, target)
+    finally:
+        if os.path.exists(staged): os.remove(staged)
@@ -0,0 +1,408 @@
+"""Headless benchmarks for the data layer (no Streamlit needed).
+
+    python bench.py [path/to/employees.db] [--runs N]
+    python bench.py --pages out.json [--synth SCALE] [--years N]
+    python bench.py --rosters [--synth SCALE]
+    python bench.py --startup   (needs streamlit)
+    python bench.py --columnar [--synth SCALE]
+    python bench.py --writers N [--writes M]
+"""
+import sqlite3, sys, time, shutil, tempfile, os, argparse, statistics, json, platform
+import db
+from synth import LAST, FIRST
+
+# The queries one "Historial Sick Hours" rerun issues: sidebar count, company
+# picker, crews picker, history and totals.
+RERUN = [
+    ("SELECT COUNT(*) FROM workers", ()),
+    ("SELECT id,name FROM companies ORDER BY name", ()),
+    ("SELECT id,crew_code,foreman_name FROM crews WHERE company_id=? ORDER BY crew_code", (2,)),
+    ("""SELECT s.id,s.sick_date,s.hours,s.notes,w.full_name worker,c.name company,cr.crew_code crew
+        FROM sick_hours s JOIN workers w ON w.id=s.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id
+        WHERE s.sick_date BETWEEN ? AND ? ORDER BY s.sick_date DESC,s.id DESC""", ("2025-01-01", "2099-12-31")),
+    ("""SELECT w.full_name worker,SUM(s.hours) total_hours FROM sick_hours s JOIN workers w ON w.id=s.worker_id
+        WHERE s.sick_date BETWEEN ? AND ? GROUP BY s.worker_id ORDER BY w.full_name""", ("2025-01-01", "2099-12-31")),
+]
+
+def legacy_q(sql, p=()):
+    # Pre-pool behaviour: a fresh connection per query.
+    with sqlite3.connect(db.DB, check_same_thread=False) as c:
+        cur = c.execute(sql, p); rows = cur.fetchall()
+    return rows
+
+def timed(fn, runs):
+    out = []
+    for _ in range(runs):
+        t0 = time.perf_counter(); fn(); out.append((time.perf_counter() - t0) * 1000)
+    out.sort()
+    pct = lambda f: out[max(0, int(len(out)*f) - 1)]
+    return {"mean_ms": statistics.fmean(out), "p50_ms": out[len(out)//2], "p95_ms": pct(.95), "p99_ms": pct(.99)}
+
+def bench_rerun(runs):
+    res = {}
+    res["fresh_connect"] = timed(lambda: [legacy_q(s, p) for s, p in RERUN], runs)
+    db.close_all(); db.q("SELECT 1")
+    res["pooled"] = timed(lambda: [db.q(s, p, cache=False) for s, p in RERUN], runs)
+    res["pooled+cache"] = timed(lambda: [db.q(s, p) for s, p in RERUN], runs)
+    import perf
+    perf.ENABLED, was = True, perf.ENABLED
+    try:
+        res["pooled+perf"] = timed(lambda: [db.q(s, p, cache=False) for s, p in RERUN], runs)
+        res["pooled+cache+perf"] = timed(lambda: [db.q(s, p) for s, p in RERUN], runs)
+    finally:
+        perf.ENABLED = was; perf.reset()
+    return res
+
+def fill_workers(n, seed=1):
+    import random
+    rnd = random.Random(seed)
+    with db.conn() as c:
+        c.execute("INSERT OR IGNORE INTO companies(id,name) VALUES(1,'BENCH')")
+        c.execute("INSERT OR IGNORE INTO crews(id,company_id,crew_code) VALUES(1,1,'B1')")
+        c.executemany("INSERT INTO workers(full_name,company_id,crew_id,active) VALUES(?,1,1,1)",
+                      ((f"{rnd.choice(LAST)} {rnd.choice(LAST)}, {rnd.choice(FIRST)} {i}",) for i in range(n)))
+
+def bench_search(sizes, runs):
+    import search
+    like = """SELECT w.id,w.full_name,c.name,cr.crew_code FROM workers w JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id
+              WHERE w.full_name LIKE ? ORDER BY w.full_name LIMIT 300"""
+    res, have = {}, 0
+    for n in sizes:
+        fill_workers(n - have, seed=n); have = n
+        # A broad query (matches ~1% of the roster) and a selective one.
+        res[n] = {"like broad": timed(lambda: db.q(like, ("%nuñez%jes%",)), runs),
+                  "fts broad": timed(lambda: search.find_workers("nunez jes"), runs),
+                  "like exact": timed(lambda: db.q(like, ("%nuñez%229%",)), runs),
+                  "fts exact": timed(lambda: search.find_workers("nunez 229"), runs)}
+    return res
+
+def fill_events(n, seed=1):
+    import random
+    rnd = random.Random(seed)
+    _, r = db.q("SELECT id FROM workers", cache=False); ids = [x[0] for x in r] or [1]
+    with db.conn() as c:
+        c.executemany("INSERT INTO sick_hours(worker_id,sick_date,hours,notes) VALUES(?,?,?,?)",
+                      ((rnd.choice(ids), f"{rnd.randint(2020,2025)}-{rnd.randint(1,12):02d}-{rnd.randint(1,28):02d}",
+                        rnd.choice((4.0, 8.0)), "nota de prueba " * rnd.randint(0, 4)) for _ in range(n)))
+
+def bench_backup(events):
+    """backup_zip()/restore_zip() on their own, plus "download": reading the
+    finished zip the way the Respaldos page hands it to Streamlit."""
+    import backup, tracemalloc
+    fill_events(events)
+    size = os.path.getsize(db.DB) / 1e6
+    res = {}
+    tracemalloc.start()
+    t0 = time.perf_counter(); path = backup.backup_zip(); dt = time.perf_counter() - t0
+    res["backup_zip"] = {"s": dt, "MB/s": size / dt, "peak_MB": tracemalloc.get_traced_memory()[1] / 1e6,
+                     "zip_MB": os.path.getsize(path) / 1e6}
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    with open(path, "rb") as f: data = f.read()
+    dt = time.perf_counter() - t0
+    res["download"] = {"s": dt, "peak_MB": tracemalloc.get_traced_memory()[1] / 1e6}
+    del data; tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    with open(path, "rb") as f: backup.restore_zip(f)
+    dt = time.perf_counter() - t0
+    res["restore_zip"] = {"s": dt, "MB/s": size / dt, "peak_MB": tracemalloc.get_traced_memory()[1] / 1e6}
+    tracemalloc.stop(); os.remove(path)
+    return size, res
+
+# --- Page-by-page suite ---
+# Each entry replays what one menu page runs outside Streamlit (SQL plus
+# to_dicts/csv_bytes/export work) and returns the number of rows it handled.
+HIST = {  # page -> (select, from for the count, date/id order, totals query or None)
+    "Historial Sick Hours": ("""SELECT s.id,s.sick_date,s.hours,s.notes,w.full_name worker,c.name company,cr.crew_code crew
+        FROM sick_hours s JOIN workers w ON w.id=s.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+        "FROM sick_hours s JOIN workers w ON w.id=s.worker_id", ("s.sick_date", "s.id"),
+        "SELECT w.full_name worker,SUM(s.hours) total_hours FROM sick_hours s JOIN workers w ON w.id=s.worker_id {where} GROUP BY s.worker_id ORDER BY w.full_name"),
+    "Historial Warnings": ("""SELECT wr.id,wr.warn_date,wr.warn_type,wr.notes,w.full_name worker,c.name company,cr.crew_code crew
+        FROM warnings wr JOIN workers w ON w.id=wr.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+        "FROM warnings wr JOIN workers w ON w.id=wr.worker_id", ("wr.warn_date", "wr.id"),
+        "SELECT w.full_name worker,COUNT(*) total_warnings FROM warnings wr JOIN workers w ON w.id=wr.worker_id {where} GROUP BY wr.worker_id ORDER BY w.full_name"),
+    "Historial Accidentes": ("""SELECT a.id,a.accident_date,a.injury_type,a.description,a.notes,w.full_name worker,c.name company,cr.crew_code crew
+        FROM accidents a JOIN workers w ON w.id=a.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+        "FROM accidents a JOIN workers w ON w.id=a.worker_id", ("a.accident_date", "a.id"),
+        "SELECT w.full_name worker,COUNT(*) total_accidents FROM accidents a JOIN workers w ON w.id=a.worker_id {where} GROUP BY a.worker_id ORDER BY w.full_name"),
+    "PPE Movimientos (historial)": ("""SELECT pe.id,pe.date,pe.item,pe.action,pe.qty,pe.size,pe.notes,w.full_name worker,c.name company,cr.crew_code crew
+        FROM ppe_events pe JOIN workers w ON w.id=pe.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+        "FROM ppe_events pe JOIN workers w ON w.id=pe.worker_id", ("pe.date", "pe.id"), None),
+}
+
+def page_history(name, f, t):
+    select, count_from, order, totals = HIST[name]
+    where, p = f"WHERE {order[0]} BETWEEN ? AND ?", [f, t]
+    db.count(count_from, where, p)
+    n = db.keyset_page(select, where, p, order, 100, arrow=True).num_rows
+    if totals:
+        rows = db.q(totals.format(where=where), tuple(p), arrow=True); db.csv_bytes(rows); n += rows.num_rows
+    return n
+
+def page_export(name, f, t):
+    import export
+    select, _, order, _ = HIST[name]
+    path = export.csv_file(f"{select} WHERE {order[0]} BETWEEN ? AND ? ORDER BY {order[0]} DESC,{order[1]} DESC", (f, t), "gzip")
+    os.remove(path)
+    return db.count(HIST[name][1], f"WHERE {order[0]} BETWEEN ? AND ?", (f, t))
+
+def page_crew(company, crew):
+    rows = db.q("""SELECT w.full_name trabajador,w.start_date alta,w.termination_date baja,
+                   CASE WHEN w.active=1 THEN 'Sí' ELSE 'No' END activo,c.name company,cr.crew_code crew,cr.foreman_name foreman,
+                   w.gloves_issued_date,w.gloves_returned_date,w.sleeves_issued_date,w.sleeves_returned_date,w.notes
+                   FROM workers w JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id
+                   WHERE w.company_id=? AND w.active=1 ORDER BY w.full_name""", (company,), arrow=True)
+    return rows.num_rows
+
+def page_listado(company, crew):
+    import ppe_balance
+    c, r = db.q("""SELECT w.id,w.full_name,w.start_date,w.active,w.gloves_issued_date,w.gloves_returned_date,w.sleeves_issued_date,w.sleeves_returned_date
+                   FROM workers w WHERE w.company_id=? AND w.crew_id=? ORDER BY w.full_name""", (company, crew))
+    with db.conn(ppe_balance.SNAPSHOT_TABLES) as cx: ppe_balance.current(cx).per_worker()
+    return len(db.to_dicts(c, r))
+
+def page_ppe_outstanding():
+    import ppe_balance
+    with db.conn(ppe_balance.SNAPSHOT_TABLES) as cx:
+        bal = ppe_balance.current(cx)
+        return len(ppe_balance.crew_outstanding(cx, bal)[1]) + len(ppe_balance.mismatches(cx, bal)[1])
+
+def page_dashboard(f, t):
+    where, p = "WHERE r.month BETWEEN ? AND ?", (f[:7], t[:7])
+    c, r = db.q(f"""SELECT r.month mes,SUM(r.sick_hours),SUM(r.warnings),SUM(r.accidents),SUM(r.gloves_issued),SUM(r.sleeves_issued)
+                    FROM rollup_monthly r {where} GROUP BY r.month ORDER BY r.month""", p)
+    n = len(db.to_dicts(c, r))
+    c, r = db.q(f"""SELECT co.name company,cr.crew_code crew,COUNT(DISTINCT r.worker_id),SUM(r.sick_hours),SUM(r.warnings),SUM(r.accidents),
+                    SUM(r.gloves_issued-r.gloves_returned),SUM(r.sleeves_issued-r.sleeves_returned)
+                    FROM rollup_monthly r JOIN crews cr ON cr.id=r.crew_id JOIN companies co ON co.id=r.company_id
+                    {where} GROUP BY r.crew_id ORDER BY 4 DESC""", p)
+    return n + len(db.to_dicts(c, r))
+
+def page_backup():
+    import backup
+    path = backup.backup_zip(); os.remove(path)
+    return db.q("SELECT (SELECT COUNT(*) FROM workers)+(SELECT COUNT(*) FROM sick_hours)+(SELECT COUNT(*) FROM warnings)"
+                "+(SELECT COUNT(*) FROM accidents)+(SELECT COUNT(*) FROM ppe_events)")[1][0][0]
+
+def page_parquet():
+    import export
+    os.remove(export.parquet_zip())
+    return sum(db.count(f"FROM {t}", "", ()) for t in export.PARQUET_TABLES)
+
+def pages():
+    import search
+    _, r = db.q("SELECT MAX(sick_date) FROM sick_hours", cache=False); t = r[0][0] or "2025-12-31"
+    f = f"{int(t[:4]) - 1}{t[4:]}"   # the last year of data
+    _, r = db.q("SELECT company_id,crew_id FROM workers GROUP BY crew_id ORDER BY COUNT(*) DESC LIMIT 1", cache=False)
+    company, crew = r[0] if r else (1, 1)
+    out = {"sidebar": lambda: len(db.q("SELECT COUNT(*) FROM workers")[1]),
+           "Trabajadores (buscar)": lambda: len(search.find_workers("garcia jo")[1])}
+    for name in HIST: out[name] = lambda name=name: page_history(name, f, t)
+    out["Historial trabajadores x cuadrilla"] = lambda: page_crew(company, crew)
+    out["Listado x cuadrilla (imprimible)"] = lambda: page_listado(company, crew)
+    out["PPE pendientes x cuadrilla"] = page_ppe_outstanding
+    out["Dashboard"] = lambda: page_dashboard(f, t)
+    out["CSV.gz historial sick hours"] = lambda: page_export("Historial Sick Hours", f, t)
+    out["Respaldos: backup zip"] = page_backup
+    out["Parquet eventos (zip)"] = page_parquet
+    return out
+
+def bench_pages(runs):
+    """{page: latency percentiles, rows, rows_per_s, peak_MB}. The query cache is
+    cleared before every run, so each one is a first render after a write.
+    peak_MB is Python allocations only (tracemalloc); Arrow buffers are not in it."""
+    import tracemalloc
+    res = {}
+    for name, fn in pages().items():
+        rows = []
+        def run(): db.clear_cache(); rows.append(fn())
+        n = 3 if name.startswith(("CSV", "Respaldos", "Parquet")) else runs
+        r = timed(run, n)
+        db.clear_cache(); tracemalloc.start(); fn(); peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+        r.update(rows=rows[-1], rows_per_s=rows[-1] / (r["p50_ms"] / 1000) if r["p50_ms"] else 0, peak_MB=peak / 1e6, runs=n)
+        res[name] = r
+    return res
+
+def bench_rosters(max_jobs=None):
+    """Wall time to render every crew with 1, 2, 4, ... worker processes."""
+    import rosters
+    res, j = {}, 1
+    max_jobs = max_jobs or os.cpu_count() or 1
+    while True:
+        t0 = time.perf_counter(); path, n = rosters.build(db.DB, jobs=j); dt = time.perf_counter() - t0
+        res[j] = {"s": dt, "crews": n, "crews/s": n / dt, "zip_MB": os.path.getsize(path) / 1e6}
+        os.remove(path)
+        if j >= max_jobs: return res
+        j = min(j * 2, max_jobs)
+
+STARTUP_WRAPPER = """import sys, time, runpy
+sys.path.insert(0, {dir!r})
+t0 = time.perf_counter()
+try: runpy.run_path({app!r}, run_name="__main__")
+finally: sys.modules["bench"].SCRIPT_MS.append((time.perf_counter() - t0) * 1000)
+"""
+SCRIPT_MS = []
+
+def bench_columnar(runs):
+    """Full sick_hours history as rows -> dicts -> DataFrame (what st.dataframe
+    did with to_dicts() output) vs. q(arrow=True)."""
+    import tracemalloc, pandas as pd
+    sql = HIST["Historial Sick Hours"][0] + " ORDER BY s.sick_date DESC,s.id DESC"
+    paths = {"rows+dicts+pandas": lambda: pd.DataFrame(db.to_dicts(*db.q(sql, cache=False))),
+             "arrow": lambda: db.q(sql, cache=False, arrow=True)}
+    res = {}
+    for k, fn in paths.items():
+        r = timed(fn, runs)
+        tracemalloc.start(); out = fn(); r["peak_py_MB"] = tracemalloc.get_traced_memory()[1] / 1e6; tracemalloc.stop()
+        r["result_MB"] = (out.nbytes if hasattr(out, "nbytes") else out.memory_usage(deep=True).sum()) / 1e6
+        r["rows"] = len(out); res[k] = r
+    return res
+
+def bench_writers(n, writes):
+    """N threads acting as sessions: each inserts a sick_hours row, then reruns the
+    history page, `writes` times. Modes:
+      baseline  the original code: a fresh connection per statement, rollback journal
+      pooled    pooled WAL connection, one commit per statement (exec_sql before the writer)
+      writer    db.exec_sql() through the writer thread
+    """
+    import threading, random
+    _, r = db.q("SELECT id FROM workers LIMIT 200", cache=False); ids = [x[0] for x in r] or [1]
+    ins = "INSERT INTO sick_hours(worker_id,sick_date,hours,notes) VALUES(?,?,?,?)"
+    base = os.path.join(os.path.dirname(db.DB), "baseline.db")
+    db.close_all(); shutil.copy(db.DB, base)
+    c = sqlite3.connect(base); c.execute("PRAGMA journal_mode=DELETE"); c.close()
+
+    def baseline_write(p):
+        c = sqlite3.connect(base, check_same_thread=False)
+        try: c.execute(ins, p); c.commit()
+        finally: c.close()
+    def baseline_read():
+        for s, p in RERUN:
+            c = sqlite3.connect(base)
+            try: c.execute(s, p).fetchall()
+            finally: c.close()
+    def pooled_write(p):
+        with db.conn(db.tables_written(ins)) as c: c.execute(ins, p)
+    def read():
+        for s, p in RERUN: db.q(s, p)
+    modes = {"baseline": (baseline_write, baseline_read), "pooled": (pooled_write, read),
+             "writer": (lambda p: db.exec_sql(ins, p), read)}
+    res = {}
+    for mode, (write, rerun) in modes.items():
+        lat, errs = [], []
+        def session(k):
+            rnd = random.Random(k)
+            for i in range(writes):
+                p = (rnd.choice(ids), f"2025-{rnd.randint(1,12):02d}-{rnd.randint(1,28):02d}", 8.0, f"carga {k}/{i}")
+                t0 = time.perf_counter()
+                try: write(p); lat.append((time.perf_counter() - t0) * 1000)
+                except Exception as e: errs.append(repr(e))
+                rerun()
+        ts = [threading.Thread(target=session, args=(k,)) for k in range(n)]
+        t0 = time.perf_counter()
+        for t in ts: t.start()
+        for t in ts: t.join()
+        dt = time.perf_counter() - t0; lat.sort()
+        res[mode] = {"writes/s": len(lat) / dt, "errors": len(errs), "error_rate": len(errs) / (n * writes),
+                     "p50_ms": lat[len(lat)//2] if lat else 0, "p95_ms": lat[max(0, int(len(lat)*.95) - 1)] if lat else 0,
+                     "first_error": errs[0] if errs else ""}
+    return res
+
+def bench_startup(runs, app="employees_app.py"):
+    """Script execution time of the first run in this process (cold), of reruns
+    of the same session (warm) and of the first open of every page. Driven by
+    Streamlit's AppTest, but timed inside the script thread: AppTest's own
+    wall clock is dominated by its polling."""
+    from streamlit.testing.v1 import AppTest
+    sys.modules.setdefault("bench", sys.modules[__name__])
+    here = os.path.dirname(os.path.abspath(__file__))
+    wrapper = os.path.join(os.path.dirname(db.DB), "startup_app.py")
+    with open(wrapper, "w") as f: f.write(STARTUP_WRAPPER.format(dir=here, app=os.path.join(here, app)))
+    SCRIPT_MS.clear()
+    at = AppTest.from_file(wrapper, default_timeout=120).run()
+    cold = SCRIPT_MS[-1]
+    for _ in range(runs): at.run()
+    warm = sorted(SCRIPT_MS[1:])
+    res = {"cold_ms": cold, "warm": {"p50_ms": warm[len(warm)//2], "p95_ms": warm[max(0, int(len(warm)*.95) - 1)]}}
+    pages = {}
+    for o in at.sidebar.radio[0].options:
+        at.sidebar.radio[0].set_value(o); at.run(); pages[o] = SCRIPT_MS[-1]
+    res["first_open_ms"] = pages
+    return res
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("db", nargs="?", default="employees.db")
+    ap.add_argument("--runs", type=int, default=500)
+    ap.add_argument("--search", action="store_true", help="search latency vs roster size (fresh schema)")
+    ap.add_argument("--backup", type=int, metavar="EVENTS", help="backup/restore throughput after adding EVENTS sick_hours rows")
+    ap.add_argument("--pages", metavar="OUT.json", help="page-by-page suite, results written as JSON")
+    ap.add_argument("--rosters", action="store_true", help="batch roster rendering vs worker processes")
+    ap.add_argument("--startup", action="store_true", help="cold start and warm rerun of the Streamlit script")
+    ap.add_argument("--columnar", action="store_true", help="row/dict path vs Arrow path on the full sick_hours history")
+    ap.add_argument("--writers", type=int, metavar="N", help="load test: N concurrent sessions writing")
+    ap.add_argument("--writes", type=int, default=50, help="writes per session for --writers")
+    ap.add_argument("--synth", type=float, metavar="SCALE", help="with --pages/--rosters/--columnar: run on a synth.py database of this scale instead")
+    ap.add_argument("--years", type=int, default=1, help="years of events for --synth")
+    a = ap.parse_args(argv)
+    # Work on a copy: the pool switches the file to WAL mode.
+    tmp = tempfile.mkdtemp()
+    db.DB = os.path.join(tmp, "employees.db")
+    try:
+        if a.synth and (a.pages or a.rosters or a.columnar):
+            import synth
+            synth.main([db.DB, "--scale", str(a.synth), "--years", str(a.years)])
+        else:
+            shutil.copy(a.db, db.DB)
+        if a.pages:
+            db.init_schema()
+            _, r = db.q("SELECT (SELECT COUNT(*) FROM workers),(SELECT COUNT(*) FROM sick_hours),(SELECT COUNT(*) FROM warnings),"
+                        "(SELECT COUNT(*) FROM accidents),(SELECT COUNT(*) FROM ppe_events)", cache=False)
+            meta = {"db": "synth" if a.synth else a.db, "scale": a.synth, "years": a.years if a.synth else None,
+                    "rows": dict(zip(("workers", "sick_hours", "warnings", "accidents", "ppe_events"), r[0])),
+                    "db_MB": os.path.getsize(db.DB) / 1e6, "runs": a.runs, "sqlite": sqlite3.sqlite_version,
+                    "python": platform.python_version(), "when": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            res = bench_pages(min(a.runs, 50))
+            with open(a.pages, "w") as f: json.dump({"meta": meta, "pages": res}, f, indent=1, ensure_ascii=False)
+            for k, v in res.items():
+                print(f"{k:36s} p50 {v['p50_ms']:9.2f} ms  p95 {v['p95_ms']:9.2f} ms  {v['rows']:>8} rows  peak {v['peak_MB']:7.2f} MB")
+            return
+        if a.rosters:
+            db.init_schema(); db.close_all()
+            for j, v in bench_rosters().items():
+                print(f"rosters jobs {j:>2}  {v['s']:7.2f} s  {v['crews']} crews  {v['crews/s']:8.1f} crews/s  zip {v['zip_MB']:.2f} MB")
+            return
+        if a.writers:
+            db.init_schema()
+            for k, v in bench_writers(a.writers, a.writes).items():
+                print(f"writers {a.writers:>3} {k:9s} {v['writes/s']:8.1f} writes/s  errors {v['errors']:>4} ({v['error_rate']:.1%})  "
+                      f"p50 {v['p50_ms']:7.2f} ms  p95 {v['p95_ms']:7.2f} ms  {v['first_error'][:60]}")
+            return
+        if a.columnar:
+            db.init_schema()
+            for k, v in bench_columnar(min(a.runs, 5)).items():
+                print(f"columnar {k:18s} p50 {v['p50_ms']:9.1f} ms  {v['rows']} rows  peak py {v['peak_py_MB']:7.1f} MB  result {v['result_MB']:7.1f} MB")
+            return
+        if a.startup:
+            r = bench_startup(min(a.runs, 50))
+            print(f"startup cold {r['cold_ms']:8.1f} ms  warm rerun p50 {r['warm']['p50_ms']:.1f} ms  p95 {r['warm']['p95_ms']:.1f} ms")
+            for k, v in r["first_open_ms"].items(): print(f"  first open {k:36s} {v:8.1f} ms")
+            return
+        if a.search:
+            os.remove(db.DB); db.init_schema()
+            for n, r in bench_search([300, 3_000, 30_000, 300_000], min(a.runs, 50)).items():
+                for k, v in r.items():
+                    print(f"search {n:>7} workers {k:10s} p50 {v['p50_ms']:8.3f} ms  p95 {v['p95_ms']:8.3f} ms")
+            return
+        if a.backup:
+            db.init_schema(); size, res = bench_backup(a.backup)
+            for k, v in res.items():
+                print(f"{k:11s} {size:8.1f} MB db  " + "  ".join(f"{m} {x:.2f}" for m, x in v.items()))
+            return
+        for k, v in bench_rerun(a.runs).items():
+            print(f"rerun {k:14s} mean {v['mean_ms']:.3f} ms  p50 {v['p50_ms']:.3f} ms  p95 {v['p95_ms']:.3f} ms")
+    finally:
+        db.close_all(); shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
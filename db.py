@@ -0,0 +1,320 @@
+import sqlite3, os, io, csv, re, threading, queue
+from collections import OrderedDict
+from contextlib import contextmanager
+import migrations, perf, writer
+
+DB = "employees.db"
+POOL_SIZE = 8
+BUSY_TIMEOUT = 5.0   # seconds a statement waits on another connection's lock before SQLITE_BUSY
+
+# Applied once per connection; journal_mode=WAL persists in the file itself.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",      # ~16 MB page cache
+    "PRAGMA mmap_size=67108864",     # 64 MB
+    "PRAGMA temp_store=MEMORY",
+)
+
+CACHE_MAX_ROWS = 200_000   # total rows held by the query cache across all entries
+
+# Writes to a key also change what reads of the values return (trigger-maintained tables).
+TRIGGERED = {"workers": ("workers_fts", "workers_fts_vocab", "rollup_monthly"),
+             **{t: ("rollup_monthly",) for t in ("sick_hours", "warnings", "accidents")},
+             "ppe_events": ("rollup_monthly", "ppe_balance_snapshot", "ppe_snapshot_meta")}
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_lock = threading.Lock()
+_gen = 0  # bumped by close_all(); connections from older generations are discarded
+_cv = threading.Condition()
+_busy = 0        # connections currently checked out
+_paused = False  # set by exclusive(): new checkouts wait
+
+def _connect():
+    c = sqlite3.connect(DB, timeout=BUSY_TIMEOUT, check_same_thread=False, cached_statements=256)
+    for p in PRAGMAS: c.execute(p)
+    return c
+
+def _checkout():
+    try: return _pool.get_nowait()
+    except queue.Empty: return (_gen, _connect())
+
+def _checkin(item):
+    g, c = item
+    if g != _gen:
+        c.close(); return
+    try: _pool.put_nowait(item)
+    except queue.Full: c.close()
+
+@contextmanager
+def conn(writes=None):
+    """Pooled connection, committed on exit. Any change made through it
+    invalidates cached reads of `writes` (or of every table when not given)."""
+    global _busy
+    with _cv:
+        _cv.wait_for(lambda: not _paused)
+        _busy += 1
+    try:
+        item = _checkout()
+        if item[0] != _gen:
+            item[1].close(); item = (_gen, _connect())
+        c = item[1]; before = c.total_changes
+        try:
+            yield c
+            c.commit()
+        except BaseException:
+            c.rollback(); raise
+        finally:
+            if c.total_changes != before: bump(writes)
+            _checkin(item)
+    finally:
+        with _cv:
+            _busy -= 1; _cv.notify_all()
+
+def close_all():
+    """Close every pooled connection (e.g. before the DB file is replaced)."""
+    global _gen
+    with _lock:
+        _gen += 1
+        while True:
+            try: _pool.get_nowait()[1].close()
+            except queue.Empty: break
+    bump()
+
+# --- Query cache ---
+# Entries remember the write generation of every table they read; exec_sql()
+# and conn() bump generations, so a hit is only served while nothing it read
+# has changed. Writes from other processes are caught by sync() through the
+# trigger-maintained table_versions. Module-level, so every Streamlit session
+# shares it.
+_cache = OrderedDict()   # (sql, params) -> (epoch, {table: gen}, cols, rows)
+_cache_rows = 0
+_tables = {}             # table -> write generation
+_epoch = 0               # bumped when "everything" may have changed
+_stats = {"hits": 0, "misses": 0}
+_clock = threading.Lock()
+
+_READS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)", re.I)
+_WRITES = re.compile(r"\b(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)", re.I)
+
+def tables_read(sql): return {t.lower() for t in _READS.findall(sql)}
+
+def tables_written(sql):
+    ts = {t.lower() for t in _WRITES.findall(sql)}
+    for t in list(ts): ts.update(TRIGGERED.get(t, ()))
+    return ts
+
+def bump(tables=None):
+    """Invalidate cached reads of `tables` (all tables when None)."""
+    global _epoch
+    with _clock:
+        if tables is None: _epoch += 1
+        else:
+            for t in tables: _tables[t] = _tables.get(t, 0) + 1
+
+_watch = None   # [pool generation, connection, (data_version, schema_version), {table: version}]
+_watch_lock = threading.Lock()
+
+def _versions(c):
+    dv = (c.execute("PRAGMA data_version").fetchone()[0], c.execute("PRAGMA schema_version").fetchone()[0])
+    try: return dv, dict(c.execute("SELECT tbl,v FROM table_versions"))
+    except sqlite3.OperationalError: return dv, {}   # before migration 7
+
+def sync():
+    """Invalidate cached reads of the tables another process wrote since the
+    last call (rollups.py --rebuild, migrations.py, the sqlite3 shell): the
+    table_versions counts kept by triggers (migration 7) are compared with
+    the last ones seen. This process's writes already bumped their tables in
+    conn(); here they only cost one more miss on those tables. A schema change
+    invalidates everything. The app calls it once per rerun; while nothing
+    was committed it costs two pragmas."""
+    global _watch
+    with _watch_lock:
+        if _watch is None or _watch[0] != _gen:   # first call, or the file was replaced
+            if _watch: _watch[1].close()
+            c = sqlite3.connect(DB, check_same_thread=False)
+            _watch = [_gen, c, *_versions(c)]
+            return False
+        c = _watch[1]
+        dv = (c.execute("PRAGMA data_version").fetchone()[0], c.execute("PRAGMA schema_version").fetchone()[0])
+        if dv == _watch[2]: return False
+        schema = dv[1] != _watch[2][1]
+        dv, vers = _versions(c)
+        changed = {t for t, v in vers.items() if _watch[3].get(t) != v}
+        _watch[2:] = [dv, vers]
+    if schema: bump(); return True
+    for t in list(changed): changed.update(TRIGGERED.get(t, ()))
+    if changed: bump(changed)
+    return bool(changed)
+
+def clear_cache():
+    global _cache_rows
+    with _clock:
+        _cache.clear(); _cache_rows = 0
+
+def cache_stats():
+    with _clock:
+        return dict(_stats, entries=len(_cache), rows=_cache_rows)
+
+def _cache_get(key, deps):
+    with _clock:
+        e = _cache.get(key)
+        if e and e[0] == _epoch and all(_tables.get(t, 0) == g for t, g in e[1].items()):
+            _cache.move_to_end(key); _stats["hits"] += 1
+            return (e[2], e[3]), None
+        _stats["misses"] += 1
+        return None, (_epoch, {t: _tables.get(t, 0) for t in deps})
+
+def _cache_put(key, snap, cols, rows):
+    global _cache_rows
+    with _clock:
+        if len(rows) > CACHE_MAX_ROWS // 4: return
+        old = _cache.pop(key, None)
+        if old: _cache_rows -= len(old[3])
+        _cache[key] = (snap[0], snap[1], cols, rows); _cache_rows += len(rows)
+        while _cache_rows > CACHE_MAX_ROWS:
+            _cache_rows -= len(_cache.popitem(last=False)[1][3])
+
+@contextmanager
+def exclusive(timeout=30):
+    """Drain the pool: hold off new checkouts, wait for the ones in flight to
+    come back, then close every connection. Used to swap the DB file."""
+    global _paused
+    with _cv:
+        _paused = True
+        if not _cv.wait_for(lambda: _busy == 0, timeout):
+            _paused = False; _cv.notify_all()
+            raise TimeoutError("la base sigue en uso")
+    try:
+        close_all()
+        yield
+    finally:
+        with _cv:
+            _paused = False; _cv.notify_all()
+
+def remove_sidecars(path=None):
+    path = path or DB
+    for ext in ("-wal", "-shm"):
+        if os.path.exists(path + ext): os.remove(path + ext)
+
+def ensure_db_exists():
+    if not os.path.exists(DB) and os.path.exists("employees_empty.db"):
+        with open("employees_empty.db","rb") as src, open(DB,"wb") as dst:
+            dst.write(src.read())
+
+ARROW_CHUNK = 20_000
+
+def arrow_table(cur, chunk=ARROW_CHUNK):
+    """pyarrow.Table from `cur`, converted column by column `chunk` rows at a
+    time, so no list of row tuples for the whole result ever exists."""
+    import pyarrow as pa
+    names=[d[0] for d in cur.description]; parts=[]
+    while True:
+        rows=cur.fetchmany(chunk)
+        if not rows: break
+        cols=[]
+        for col in zip(*rows):
+            try: cols.append(pa.array(col))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):   # mixed types in one column (SQLite is dynamic)
+                cols.append(pa.array([None if v is None else str(v) for v in col]))
+        parts.append(pa.table(cols,names=names))
+    if not parts: return pa.table({n: pa.array([], pa.null()) for n in names})
+    for i,n in enumerate(names):
+        # One chunk may have fallen back to strings where another did not:
+        # a column whose chunk types cannot be unified becomes string throughout.
+        try: pa.unify_schemas([pa.schema([t.schema.field(i)]) for t in parts],promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            parts=[t.set_column(i,n,t.column(i).cast(pa.string())) for t in parts]
+    return pa.concat_tables(parts,promote_options="permissive")
+
+def q(sql,p=(),cache=True,arrow=False):
+    """(cols, rows) of `sql`; with arrow=True a pyarrow.Table built by
+    arrow_table() instead (st.dataframe takes it as is)."""
+    if perf.ENABLED: t0=perf.clock()
+    deps=tables_read(sql) if cache else None
+    if deps:
+        key=(sql,tuple(p),arrow); hit,snap=_cache_get(key,deps)
+        if hit:
+            if perf.ENABLED: perf.record("q",sql,p,t0,len(hit[1]),True,hit[1])
+            return hit[1] if arrow else hit
+    with conn() as c:
+        cur=c.execute(sql,p)
+        if arrow: rows=arrow_table(cur); cols=rows.column_names
+        else:
+            cols=[d[0] for d in cur.description] if cur.description else []
+            rows=cur.fetchall()
+    if deps: _cache_put(key,snap,cols,rows)
+    if perf.ENABLED: perf.record("q",sql,p,t0,len(rows),rows_obj=rows)
+    return rows if arrow else (cols,rows)
+
+def exec_sql(sql,p=()):
+    """Run one write through the writer thread (batched with other sessions'
+    writes); returns its row count or raises its error here, including
+    "database is locked" when it could not run within writer.TIMEOUT."""
+    if perf.ENABLED: t0=perf.clock()
+    n=writer.wait(writer.submit(sql,p))
+    if perf.ENABLED: perf.record("exec",sql,p,t0,max(n,0))
+    return n
+
+class Tx:
+    """Statements issued inside transaction(); remembers which tables they write."""
+    def __init__(self, c, tables): self.c, self.tables = c, tables
+    def exec(self, sql, p=()):
+        self.tables |= tables_written(sql)
+        return self.c.execute(sql, p)
+    def many(self, sql, seq):
+        self.tables |= tables_written(sql)
+        return self.c.executemany(sql, seq)
+
+@contextmanager
+def transaction():
+    """Group writes into one atomic commit:
+
+        with transaction() as tx:
+            tx.exec("DELETE ..."); tx.exec("UPDATE ...")
+
+    Everything is rolled back if the block raises."""
+    tables = set()
+    with conn(tables) as c:
+        c.execute("BEGIN IMMEDIATE")   # take the write lock now, not on first write
+        yield Tx(c, tables)
+
+def to_dicts(cols, rows):
+    out=[dict(zip(cols, r)) for r in rows]
+    if perf.ENABLED: perf.converted(rows, out)
+    return out
+
+def csv_bytes(rows):
+    if hasattr(rows,"schema"):   # pyarrow.Table from q(..., arrow=True)
+        import pyarrow.csv as pc
+        buf=io.BytesIO(); pc.write_csv(rows,buf)
+        return "\ufeff".encode()+buf.getvalue()
+    if not rows: return b""
+    buf=io.StringIO(); w=csv.DictWriter(buf, fieldnames=list(rows[0].keys())); w.writeheader()
+    for r in rows: w.writerow(r)
+    return buf.getvalue().encode("utf-8-sig")
+
+def init_schema():
+    """Bring the DB up to the latest migration (also used after a restore)."""
+    with conn() as c:
+        migrations.migrate(c)
+        c.execute("PRAGMA optimize")
+
+def keyset_sql(select, where, order, after=False, limit=True):
+    """SQL keyset_page() runs; with limit=False the whole ordered result (CSV export)."""
+    d, i = order
+    if after: where += f" AND ({d},{i})<(?,?)"
+    return f"{select} {where} ORDER BY {d} DESC,{i} DESC" + (" LIMIT ?" if limit else "")
+
+def keyset_page(select, where, p, order, size, after=None, arrow=False):
+    """One page of `select` + `where` ordered by `order`=(date_col, id_col) DESC.
+    `after` is the (date, id) of the previous page's last row. Fetches size+1
+    rows so the caller can tell whether another page follows."""
+    if after: p = [*p, *after]
+    return q(keyset_sql(select, where, order, bool(after)), (*p, size + 1), arrow=arrow)
+
+def count_sql(select_from, where): return f"SELECT COUNT(*) {select_from} {where}"
+
+def count(select_from, where, p):
+    """COUNT(*) over `select_from` ("FROM ... JOIN ...") + `where`."""
+    return q(count_sql(select_from, where), tuple(p))[1][0][0]
@@ -0,0 +1,144 @@
+"""Streaming CSV export: rows go from the cursor to disk in chunks.
+
+Nothing here holds a full table in memory; gzip and zip outputs are
+compressed as they are written. The event tables can also be exported as
+Parquet, partitioned by year and month of their date column.
+
+    python export.py --parquet OUT_DIR [path/to/employees.db]
+"""
+import csv, gzip, io, os, shutil, tempfile, zipfile, argparse
+import db
+from db import conn
+from migrations import ROLLUP_SOURCES
+
+CHUNK = 5000
+COMPRESSIONS = {None: ("", "text/csv"), "gzip": (".gz", "application/gzip"), "zip": (".zip", "application/zip")}
+
+# Full-table exports offered on "Exportar CSV".
+TABLES = [("companies","SELECT * FROM companies ORDER BY name"),
+          ("crews","SELECT * FROM crews ORDER BY company_id,crew_code"),
+          ("workers","SELECT * FROM workers ORDER BY id DESC"),
+          ("warnings","SELECT * FROM warnings ORDER BY id DESC"),
+          ("accidents","SELECT * FROM accidents ORDER BY id DESC"),
+          ("sick_hours","SELECT * FROM sick_hours ORDER BY sick_date DESC, id DESC"),
+          ("ppe_events","SELECT * FROM ppe_events ORDER BY date DESC, id DESC")]
+
+def iter_rows(sql, p=(), chunk=CHUNK):
+    """Yield the header, then every row, reading the cursor `chunk` rows at a time."""
+    with conn() as c:
+        cur = c.execute(sql, p)
+        yield [d[0] for d in cur.description]
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows: break
+            yield from rows
+
+def write_csv(f, sql, p=()):
+    """Write the full result of `sql` as CSV to text stream `f`; returns the data row count."""
+    w = csv.writer(f); n = -1
+    for n, row in enumerate(iter_rows(sql, p)): w.writerow(row)
+    return max(n, 0)
+
+def file_name(base, compress=None):
+    return f"{base}.csv{COMPRESSIONS[compress][0]}"
+
+def mime(compress=None): return COMPRESSIONS[compress][1]
+
+def _zip_text(zf, name):
+    # zf.open(..., "w") streams into the entry; force_zip64 lifts the 2 GiB limit
+    # since the final size is unknown up front.
+    return io.TextIOWrapper(zf.open(name, "w", force_zip64=True), encoding="utf-8-sig", newline="")
+
+def csv_file(sql, p=(), compress=None, name="export", dir=None):
+    """Stream the result into a UTF-8 (BOM) temp file (in `dir`), optionally
+    gzip/zip compressed, and return its path."""
+    fd, path = tempfile.mkstemp(suffix=COMPRESSIONS[compress][0] or ".csv", dir=dir)
+    os.close(fd)
+    if compress == "gzip":
+        with gzip.open(path, "wt", encoding="utf-8-sig", newline="", compresslevel=6) as f: write_csv(f, sql, p)
+    elif compress == "zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf, _zip_text(zf, f"{name}.csv") as f: write_csv(f, sql, p)
+    else:
+        with open(path, "w", encoding="utf-8-sig", newline="") as f: write_csv(f, sql, p)
+    return path
+
+def archive(tables=TABLES, dir=None):
+    """One zip (temp file in `dir`) with a CSV per table, each streamed straight into its entry."""
+    fd, path = tempfile.mkstemp(suffix=".zip", dir=dir)
+    os.close(fd)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for n, sql in tables:
+            with _zip_text(zf, f"{n}.csv") as f: write_csv(f, sql)
+    return path
+
+# --- Parquet ---
+# Hive-style layout readable by pandas/pyarrow/duckdb/spark:
+#   sick_hours/year=2025/month=03/part-0.parquet
+# Rows without a date go to year=__HIVE_DEFAULT_PARTITION__.
+PARQUET_TABLES = {t: col for t, (col, _) in ROLLUP_SOURCES.items()}
+NO_DATE = "__HIVE_DEFAULT_PARTITION__"
+
+def _arrow_schema(c, table):
+    """Arrow schema from the declared SQLite column types (stable across partitions)."""
+    import pyarrow as pa
+    kind = lambda t: pa.int64() if "INT" in t else pa.float64() if t.upper() in ("REAL", "FLOAT", "DOUBLE") else pa.string()
+    return pa.schema([(n, kind((t or "").upper())) for _, n, t, *_ in c.execute(f"PRAGMA table_info({table})")])
+
+def parquet_table(out_dir, table, date_col, chunk=CHUNK * 10):
+    """Write `table` under out_dir/table/year=YYYY/month=MM/; returns the row count.
+    Rows are read in date order so only one partition file is open at a time."""
+    import pyarrow as pa, pyarrow.parquet as pq
+    n, writer, part = 0, None, None
+    with conn() as c:
+        schema = _arrow_schema(c, table)
+        cur = c.execute(f"SELECT coalesce(substr({date_col},1,4),''),coalesce(substr({date_col},6,2),''),* FROM {table} "
+                        f"ORDER BY {date_col},id")
+        try:
+            while True:
+                rows = cur.fetchmany(chunk)
+                if not rows: break
+                i = 0
+                while i < len(rows):
+                    key = rows[i][:2]; j = i
+                    while j < len(rows) and rows[j][:2] == key: j += 1
+                    if key != part:
+                        if writer: writer.close()
+                        y, m = key
+                        d = os.path.join(out_dir, table, f"year={y or NO_DATE}", *([f"month={m}"] if y else []))
+                        os.makedirs(d, exist_ok=True)
+                        writer = pq.ParquetWriter(os.path.join(d, "part-0.parquet"), schema, compression="zstd"); part = key
+                    cols = list(zip(*(r[2:] for r in rows[i:j])))
+                    writer.write_table(pa.table([pa.array(v, f.type) for v, f in zip(cols, schema)], schema=schema))
+                    n += j - i; i = j
+        finally:
+            if writer: writer.close()
+    return n
+
+def parquet_dir(out_dir, tables=PARQUET_TABLES):
+    """Every event table as partitioned Parquet under `out_dir`; returns {table: rows}."""
+    return {t: parquet_table(out_dir, t, col) for t, col in tables.items()}
+
+def parquet_zip(tables=PARQUET_TABLES, dir=None):
+    """parquet_dir() packed into a temp zip in `dir` (stored: Parquet is already compressed); returns its path."""
+    tmp = tempfile.mkdtemp(dir=dir)
+    try:
+        parquet_dir(tmp, tables)
+        fd, path = tempfile.mkstemp(suffix=".zip", dir=dir); os.close(fd)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+            for root, _, files in os.walk(tmp):
+                for f in files:
+                    full = os.path.join(root, f); zf.write(full, os.path.relpath(full, tmp))
+        return path
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("db", nargs="?", default="employees.db")
+    ap.add_argument("--parquet", metavar="OUT_DIR", required=True)
+    a = ap.parse_args(argv)
+    db.DB = a.db
+    for t, n in parquet_dir(a.parquet).items(): print(f"{t}: {n} filas")
+
+if __name__ == "__main__":
+    main()
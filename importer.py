@@ -0,0 +1,183 @@
+"""Bulk import of workers, sick hours, warnings and PPE events from CSV/XLSX.
+
+Files are read row by row, names are resolved to ids through lookup maps
+built once per import, and valid rows are inserted with executemany() in
+batched transactions. Each row carries an idempotency key (a hash of its
+resolved values) stored in a UNIQUE import_key column, so importing the
+same file twice does not duplicate anything. Rejected rows are written to a
+CSV error report.
+"""
+import csv, hashlib, io, math, os, tempfile
+from datetime import date, datetime
+import db
+from search import terms
+
+BATCH = 5000
+
+# Accepted header spellings -> canonical field.
+ALIASES = {
+    "nombre": "full_name", "name": "full_name", "trabajador": "worker", "worker_name": "worker",
+    "compañia": "company", "compania": "company", "compañía": "company", "empresa": "company",
+    "cuadrilla": "crew", "crew_code": "crew", "alta": "start_date", "fecha_alta": "start_date",
+    "fecha": "date", "sick_date": "date", "warn_date": "date", "horas": "hours",
+    "tipo": "type", "warn_type": "type", "notas": "notes", "accion": "action", "acción": "action",
+    "cantidad": "qty", "talla": "size",
+}
+
+# kind -> (table, required fields, optional fields, insert columns)
+KINDS = {
+    "workers": ("workers", ("full_name", "company", "crew"), ("start_date", "notes"),
+                "full_name,company_id,crew_id,start_date,notes,active,import_key"),
+    "sick_hours": ("sick_hours", ("date", "hours"), ("notes",),
+                   "worker_id,sick_date,hours,notes,import_key"),
+    "warnings": ("warnings", ("date", "type"), ("notes",),
+                 "worker_id,warn_date,warn_type,notes,import_key"),
+    "ppe_events": ("ppe_events", ("item", "action", "date"), ("qty", "size", "notes"),
+                   "worker_id,item,action,date,qty,size,notes,import_key"),
+}
+# Event rows identify the worker by worker_id, or by worker name plus company/crew
+# when the name alone is ambiguous.
+
+def key(s): return " ".join(terms(str(s)))
+
+def _header(h): return ALIASES.get(key(h).replace(" ", "_"), key(h).replace(" ", "_"))
+
+def read_rows(fileobj, name):
+    """Yield (line, dict) pairs, the dict keyed by canonical field names,
+    streaming from CSV or XLSX. `line` is the row's line in the file (header
+    = 1), counting the blank rows that are skipped."""
+    if name.lower().endswith((".xlsx", ".xlsm")):
+        try: import openpyxl
+        except ImportError: raise ValueError("Para importar XLSX instala openpyxl (pip install openpyxl)")
+        wb = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            it = wb.active.iter_rows(values_only=True)
+            cols = [_header(h or "") for h in next(it, ())]
+            for line, row in enumerate(it, start=2):
+                if any(v not in (None, "") for v in row): yield line, dict(zip(cols, row))
+        finally:
+            wb.close()
+    else:
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        sample = text.read(4096); text.seek(0)
+        try: dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error: dialect = csv.excel
+        r = csv.reader(text, dialect)
+        cols = [_header(h) for h in next(r, [])]
+        start = r.line_num + 1   # a quoted field may span lines: report where the record starts
+        for row in r:
+            if any(v.strip() for v in row): yield start, dict(zip(cols, row))
+            start = r.line_num + 1
+        text.detach()
+
+def _text(v): return None if v is None or str(v).strip() == "" else str(v).strip()
+
+def _date(v):
+    if isinstance(v, datetime): return v.date().isoformat()
+    if isinstance(v, date): return v.isoformat()
+    s = _text(v)
+    if s is None: return None
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%m/%d/%y", "%Y/%m/%d"):
+        try: return datetime.strptime(s, fmt).date().isoformat()
+        except ValueError: pass
+    raise ValueError(f"fecha inválida: {s}")
+
+def _num(v, name):
+    try: x = float(str(v).replace(",", "."))
+    except (TypeError, ValueError): raise ValueError(f"{name} inválido: {v}")
+    if not math.isfinite(x): raise ValueError(f"{name} inválido: {v}")   # inf/nan
+    return x
+
+class Lookups:
+    """Name -> id maps for companies, crews and workers, loaded once per import."""
+    def __init__(self, c):
+        self.companies = {key(n): i for i, n in c.execute("SELECT id,name FROM companies")}
+        self.crews = {(cid, key(code)): i for i, cid, code in c.execute("SELECT id,company_id,crew_code FROM crews")}
+        self.workers = {}
+        for i, n, cid, crid in c.execute("SELECT id,full_name,company_id,crew_id FROM workers"):
+            self.workers.setdefault(key(n or ""), []).append((i, cid, crid))
+        self.worker_ids = {x[0] for v in self.workers.values() for x in v}
+
+    def company(self, name):
+        cid = self.companies.get(key(name))
+        if cid is None: raise ValueError(f"compañía desconocida: {name}")
+        return cid
+
+    def crew(self, cid, code):
+        crid = self.crews.get((cid, key(code)))
+        if crid is None: raise ValueError(f"cuadrilla desconocida: {code}")
+        return crid
+
+    def worker(self, r):
+        if _text(r.get("worker_id")):
+            wid = int(_num(r["worker_id"], "worker_id"))
+            if wid not in self.worker_ids: raise ValueError(f"worker_id desconocido: {wid}")
+            return wid
+        name = _text(r.get("worker")) or _text(r.get("full_name"))
+        if not name: raise ValueError("falta worker o worker_id")
+        cands = self.workers.get(key(name), [])
+        if _text(r.get("company")):
+            cid = self.company(r["company"]); cands = [x for x in cands if x[1] == cid]
+            if _text(r.get("crew")): crid = self.crew(cid, r["crew"]); cands = [x for x in cands if x[2] == crid]
+        if not cands: raise ValueError(f"trabajador desconocido: {name}")
+        if len(cands) > 1: raise ValueError(f"nombre ambiguo ({len(cands)} trabajadores): {name}; indica compañía/cuadrilla o worker_id")
+        return cands[0][0]
+
+def _values(kind, r, lk):
+    if kind == "workers":
+        cid = lk.company(r["company"])
+        v = [_text(r["full_name"]), cid, lk.crew(cid, r["crew"]), _date(r.get("start_date")), _text(r.get("notes")), 1]
+    elif kind == "sick_hours":
+        v = [lk.worker(r), _date(r["date"]), _num(r["hours"], "hours"), _text(r.get("notes"))]
+    elif kind == "warnings":
+        v = [lk.worker(r), _date(r["date"]), _text(r["type"]), _text(r.get("notes"))]
+    else:
+        item, action = key(r["item"]), key(r["action"])
+        if item not in ("gloves", "sleeves"): raise ValueError(f"item inválido: {r['item']}")
+        if action not in ("issue", "return"): raise ValueError(f"acción inválida: {r['action']}")
+        qty = _num(r["qty"], "qty") if _text(r.get("qty")) else 1.0
+        v = [lk.worker(r), item, action, _date(r["date"]), qty, _text(r.get("size")), _text(r.get("notes"))]
+    # Workers are the same person by name, crew and start date, whatever the notes say.
+    k = hashlib.sha1(repr((kind, v[:4] if kind == "workers" else v)).encode()).hexdigest()
+    return v + [k]
+
+def import_rows(kind, rows):
+    """Validate and insert `rows` ((line, dict) pairs from read_rows()) of `kind`.
+
+    Returns {"read", "inserted", "duplicates", "errors", "error_file"}; the
+    error file (CSV: line, error, original fields) is None when every row was valid.
+    """
+    table, required, optional, cols = KINDS[kind]
+    sql = f"INSERT OR IGNORE INTO {table}({cols}) VALUES({','.join('?' * len(cols.split(',')))})"
+    res = {"read": 0, "inserted": 0, "duplicates": 0, "errors": 0, "error_file": None}
+    err, done = None, False
+    try:
+        with db.conn(db.tables_written(sql)) as c:
+            lk = Lookups(c); batch = []
+            for line, r in rows:
+                res["read"] += 1
+                try:
+                    missing = [f for f in required if _text(r.get(f)) is None]
+                    if missing: raise ValueError("faltan campos: " + ", ".join(missing))
+                    batch.append(_values(kind, r, lk))
+                except (ValueError, KeyError) as e:
+                    res["errors"] += 1
+                    if err is None:
+                        fd, res["error_file"] = tempfile.mkstemp(suffix=".csv")
+                        err = os.fdopen(fd, "w", encoding="utf-8-sig", newline="")
+                        errw = csv.writer(err); errw.writerow(["linea", "error", *r.keys()])
+                    errw.writerow([line, str(e), *r.values()])
+                if len(batch) >= BATCH: _flush(c, sql, batch, res)
+            if batch: _flush(c, sql, batch, res)
+        done = True
+    finally:
+        if err: err.close()
+        if not done and res["error_file"]: os.remove(res["error_file"])   # aborted: nobody will fetch it
+    return res
+
+def _flush(c, sql, batch, res):
+    ins = c.executemany(sql, batch).rowcount; c.commit()   # ignored duplicates count 0
+    res["inserted"] += ins; res["duplicates"] += len(batch) - ins; batch.clear()
+
+def import_file(kind, fileobj, name):
+    return import_rows(kind, read_rows(fileobj, name))
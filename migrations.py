@@ -0,0 +1,220 @@
+"""Numbered schema migrations tracked in PRAGMA user_version.
+
+    python migrations.py [path/to/employees.db] [--check-plans]
+"""
+import sqlite3, sys, re, argparse
+
+# --- Monthly rollups (migration 5) ---
+# One row per worker and month (YYYY-MM) carrying the worker's company and crew,
+# kept current by triggers on the event tables and on workers.
+ROLLUP_MEASURES = ("sick_entries", "sick_hours", "warnings", "accidents", "ppe_entries",
+                   "gloves_issued", "gloves_returned", "sleeves_issued", "sleeves_returned")
+ROLLUP_COUNTS = ("sick_entries", "warnings", "accidents", "ppe_entries")   # a row is dropped when all are 0
+
+def _ppe(item, action):
+    return f"CASE WHEN {{r}}.item='{item}' AND {{r}}.action='{action}' THEN coalesce({{r}}.qty,0) ELSE 0 END"
+
+# event table -> (date column, {measure: expression over the row {r}})
+ROLLUP_SOURCES = {
+    "sick_hours": ("sick_date", {"sick_entries": "1", "sick_hours": "coalesce({r}.hours,0)"}),
+    "warnings": ("warn_date", {"warnings": "1"}),
+    "accidents": ("accident_date", {"accidents": "1"}),
+    "ppe_events": ("date", {"ppe_entries": "1",
+                            "gloves_issued": _ppe("gloves", "issue"), "gloves_returned": _ppe("gloves", "return"),
+                            "sleeves_issued": _ppe("sleeves", "issue"), "sleeves_returned": _ppe("sleeves", "return")}),
+}
+
+def _month(r, col): return f"coalesce(substr({r}.{col},1,7),'')"
+
+def rollup_source_sql():
+    """The rollups recomputed from the raw event tables (same shape as rollup_monthly)."""
+    parts = []
+    for t, (col, m) in ROLLUP_SOURCES.items():
+        vals = ", ".join(m.get(k, "0").format(r=t) + f" {k}" for k in ROLLUP_MEASURES)
+        parts.append(f"SELECT worker_id, {_month(t, col)} month, {vals} FROM {t}")
+    sums = ", ".join(f"SUM(e.{k}) {k}" for k in ROLLUP_MEASURES)
+    return (f"SELECT e.worker_id, e.month, w.crew_id, w.company_id, {sums} FROM ("
+            + " UNION ALL ".join(parts) + ") e JOIN workers w ON w.id=e.worker_id GROUP BY e.worker_id, e.month")
+
+def _rollup_add(t, r, sign):
+    col, m = ROLLUP_SOURCES[t]
+    if sign > 0:
+        vals = ", ".join(m[k].format(r=r) for k in m)
+        upd = ", ".join(f"{k}={k}+excluded.{k}" for k in m)
+        return (f"INSERT INTO rollup_monthly(worker_id,month,crew_id,company_id,{','.join(m)}) "
+                f"SELECT {r}.worker_id, {_month(r, col)}, w.crew_id, w.company_id, {vals} FROM workers w WHERE w.id={r}.worker_id "
+                f"ON CONFLICT(worker_id,month) DO UPDATE SET {upd};")
+    upd = ", ".join(f"{k}={k}-({m[k].format(r=r)})" for k in m)
+    empty = " AND ".join(f"{k}=0" for k in ROLLUP_COUNTS)
+    where = f"worker_id={r}.worker_id AND month={_month(r, col)}"
+    return (f"UPDATE rollup_monthly SET {upd} WHERE {where};\n"
+            f"     DELETE FROM rollup_monthly WHERE {where} AND {empty};")
+
+def _rollup_schema():
+    cols = ", ".join(f"{k} {'INT' if k in ROLLUP_COUNTS else 'REAL'} NOT NULL DEFAULT 0"
+                     for k in ROLLUP_MEASURES)
+    out = [f"CREATE TABLE IF NOT EXISTS rollup_monthly(worker_id INT NOT NULL, month TEXT NOT NULL, crew_id INT, company_id INT, {cols}, PRIMARY KEY(worker_id, month));",
+           "CREATE INDEX IF NOT EXISTS ix_rollup_crew_month ON rollup_monthly(crew_id, month);",
+           "CREATE INDEX IF NOT EXISTS ix_rollup_company_month ON rollup_monthly(company_id, month);",
+           "CREATE INDEX IF NOT EXISTS ix_rollup_month ON rollup_monthly(month);"]
+    for t in ROLLUP_SOURCES:
+        out += [f"CREATE TRIGGER IF NOT EXISTS {t}_rollup_ai AFTER INSERT ON {t} BEGIN\n     {_rollup_add(t, 'new', 1)}\n    END;",
+                f"CREATE TRIGGER IF NOT EXISTS {t}_rollup_ad AFTER DELETE ON {t} BEGIN\n     {_rollup_add(t, 'old', -1)}\n    END;",
+                f"CREATE TRIGGER IF NOT EXISTS {t}_rollup_au AFTER UPDATE ON {t} BEGIN\n     {_rollup_add(t, 'old', -1)}\n     {_rollup_add(t, 'new', 1)}\n    END;"]
+    out += ["""CREATE TRIGGER IF NOT EXISTS workers_rollup_au AFTER UPDATE OF crew_id,company_id ON workers BEGIN
+     UPDATE rollup_monthly SET crew_id=new.crew_id, company_id=new.company_id WHERE worker_id=new.id;
+    END;""",
+            """CREATE TRIGGER IF NOT EXISTS workers_rollup_ad AFTER DELETE ON workers BEGIN
+     DELETE FROM rollup_monthly WHERE worker_id=old.id;
+    END;""",
+            f"INSERT INTO rollup_monthly {rollup_source_sql()};"]
+    return "\n    ".join(out)
+
+# Tables whose writes are counted in table_versions, whoever makes them (other
+# processes included); db.sync() turns the counts into cache invalidations.
+VERSIONED = ("companies", "crews", "workers", "sick_hours", "warnings", "accidents", "ppe_events",
+             "rollup_monthly", "ppe_balance_snapshot", "ppe_snapshot_meta")
+
+def _versions_schema():
+    out = ["CREATE TABLE IF NOT EXISTS table_versions(tbl TEXT PRIMARY KEY, v INT NOT NULL DEFAULT 0) WITHOUT ROWID;",
+           "INSERT OR IGNORE INTO table_versions(tbl) VALUES " + ",".join(f"('{t}')" for t in VERSIONED) + ";"]
+    for t in VERSIONED:
+        out += [f"CREATE TRIGGER IF NOT EXISTS {t}_version_{op[0].lower()} AFTER {op} ON {t} BEGIN\n"
+                f"     UPDATE table_versions SET v=v+1 WHERE tbl='{t}';\n    END;" for op in ("INSERT", "UPDATE", "DELETE")]
+    return "\n    ".join(out)
+
+# (version, script). Append only: never edit a migration that has shipped.
+MIGRATIONS = [
+    (1, """
+    CREATE TABLE IF NOT EXISTS companies(id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+    CREATE TABLE IF NOT EXISTS crews(id INTEGER PRIMARY KEY, company_id INT, crew_code TEXT, foreman_name TEXT, UNIQUE(company_id,crew_code));
+    CREATE TABLE IF NOT EXISTS workers(
+     id INTEGER PRIMARY KEY, full_name TEXT, company_id INT, crew_id INT, start_date TEXT, termination_date TEXT,
+     active INT DEFAULT 1, gloves_issued_date TEXT, gloves_returned_date TEXT, sleeves_issued_date TEXT, sleeves_returned_date TEXT, notes TEXT);
+    CREATE TABLE IF NOT EXISTS warnings(id INTEGER PRIMARY KEY, worker_id INT, warn_date TEXT, warn_type TEXT, notes TEXT);
+    CREATE TABLE IF NOT EXISTS accidents(id INTEGER PRIMARY KEY, worker_id INT, accident_date TEXT, injury_type TEXT, description TEXT, notes TEXT);
+    CREATE TABLE IF NOT EXISTS sick_hours(id INTEGER PRIMARY KEY, worker_id INT, sick_date TEXT, hours REAL, notes TEXT);
+    CREATE TABLE IF NOT EXISTS ppe_events(id INTEGER PRIMARY KEY, worker_id INT, item TEXT, action TEXT, date TEXT, qty REAL DEFAULT 1, size TEXT, notes TEXT);
+    """),
+    (2, """
+    CREATE INDEX IF NOT EXISTS ix_sick_hours_date ON sick_hours(sick_date);
+    CREATE INDEX IF NOT EXISTS ix_sick_hours_worker_date ON sick_hours(worker_id, sick_date);
+    CREATE INDEX IF NOT EXISTS ix_warnings_date ON warnings(warn_date);
+    CREATE INDEX IF NOT EXISTS ix_warnings_worker_date ON warnings(worker_id, warn_date);
+    CREATE INDEX IF NOT EXISTS ix_accidents_date ON accidents(accident_date);
+    CREATE INDEX IF NOT EXISTS ix_accidents_worker_date ON accidents(worker_id, accident_date);
+    CREATE INDEX IF NOT EXISTS ix_ppe_events_date ON ppe_events(date);
+    CREATE INDEX IF NOT EXISTS ix_ppe_events_worker_date ON ppe_events(worker_id, date);
+    CREATE INDEX IF NOT EXISTS ix_workers_company_crew_active ON workers(company_id, crew_id, active);
+    CREATE INDEX IF NOT EXISTS ix_workers_name ON workers(full_name);
+    ANALYZE;
+    """),
+    (3, """
+    CREATE VIRTUAL TABLE IF NOT EXISTS workers_fts USING fts5(
+     full_name, notes, content='workers', content_rowid='id',
+     tokenize='unicode61 remove_diacritics 2', prefix='2 3');
+    CREATE VIRTUAL TABLE IF NOT EXISTS workers_fts_vocab USING fts5vocab(workers_fts, 'row');
+    CREATE TRIGGER IF NOT EXISTS workers_fts_ai AFTER INSERT ON workers BEGIN
+     INSERT INTO workers_fts(rowid,full_name,notes) VALUES(new.id,new.full_name,new.notes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS workers_fts_ad AFTER DELETE ON workers BEGIN
+     INSERT INTO workers_fts(workers_fts,rowid,full_name,notes) VALUES('delete',old.id,old.full_name,old.notes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS workers_fts_au AFTER UPDATE OF full_name,notes ON workers BEGIN
+     INSERT INTO workers_fts(workers_fts,rowid,full_name,notes) VALUES('delete',old.id,old.full_name,old.notes);
+     INSERT INTO workers_fts(rowid,full_name,notes) VALUES(new.id,new.full_name,new.notes);
+    END;
+    INSERT INTO workers_fts(workers_fts) VALUES('rebuild');
+    INSERT INTO workers_fts(workers_fts,rank) VALUES('rank','bm25(10.0, 1.0)');
+    """),
+    (4, """
+    ALTER TABLE workers ADD COLUMN import_key TEXT;
+    ALTER TABLE sick_hours ADD COLUMN import_key TEXT;
+    ALTER TABLE warnings ADD COLUMN import_key TEXT;
+    ALTER TABLE ppe_events ADD COLUMN import_key TEXT;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_workers_import_key ON workers(import_key) WHERE import_key IS NOT NULL;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_sick_hours_import_key ON sick_hours(import_key) WHERE import_key IS NOT NULL;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_warnings_import_key ON warnings(import_key) WHERE import_key IS NOT NULL;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_ppe_events_import_key ON ppe_events(import_key) WHERE import_key IS NOT NULL;
+    """),
+    (5, _rollup_schema()),
+    (6, """
+    CREATE TABLE IF NOT EXISTS ppe_snapshot_meta(max_event_id INT NOT NULL, taken_at TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS ppe_balance_snapshot(worker_id INT NOT NULL, item TEXT NOT NULL, size TEXT NOT NULL, qty REAL NOT NULL);
+    CREATE TRIGGER IF NOT EXISTS ppe_events_snapshot_au AFTER UPDATE ON ppe_events
+     WHEN old.id <= (SELECT max_event_id FROM ppe_snapshot_meta) BEGIN
+     DELETE FROM ppe_balance_snapshot; DELETE FROM ppe_snapshot_meta;
+    END;
+    CREATE TRIGGER IF NOT EXISTS ppe_events_snapshot_ad AFTER DELETE ON ppe_events
+     WHEN old.id <= (SELECT max_event_id FROM ppe_snapshot_meta) BEGIN
+     DELETE FROM ppe_balance_snapshot; DELETE FROM ppe_snapshot_meta;
+    END;
+    """),
+    (7, _versions_schema()),
+    (8, """
+    CREATE INDEX IF NOT EXISTS ix_workers_crew_active ON workers(crew_id, active);
+    """),
+    (9, """
+    CREATE INDEX IF NOT EXISTS ix_workers_terminated ON workers(termination_date) WHERE active=0;
+    """),
+]
+
+LATEST = MIGRATIONS[-1][0]
+
+def version(c): return c.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(c):
+    """Apply every pending migration, each in its own transaction. Returns the new version."""
+    cur = version(c)
+    for v, script in MIGRATIONS:
+        if v <= cur: continue
+        # executescript() commits first, so wrap the step and the version bump together.
+        c.executescript(f"BEGIN;\n{script}\nPRAGMA user_version={v};\nCOMMIT;")
+        cur = v
+    return cur
+
+_LIMIT = re.compile(r"\bLIMIT\b", re.I)
+_AGGREGATE = re.compile(r"\b(COUNT|SUM|MIN|MAX|AVG|TOTAL)\s*\(|\bGROUP BY\b", re.I)
+
+def full_scans(c, sql, p=()):
+    """Plan steps that read a whole table. Walking an index still reads every row,
+    so `SCAN x USING INDEX` only passes when the query stops early (LIMIT) or is
+    an aggregate answered from a covering index."""
+    plan = c.execute("EXPLAIN QUERY PLAN " + sql, p).fetchall()
+    bounded, aggregate = bool(_LIMIT.search(sql)), bool(_AGGREGATE.search(sql))
+    def full(d):
+        if not d.startswith("SCAN ") or "CONSTANT ROW" in d or "VIRTUAL TABLE INDEX" in d: return False
+        if " USING " not in d: return True
+        return not (bounded or aggregate and "COVERING INDEX" in d)
+    return [d for *_, d in plan if full(d)]
+
+def check_plans(c=None, queries=None):
+    """{check: [full-scan steps]} for the app's queries (queries.PLAN_QUERIES).
+
+    Defaults to a freshly migrated in-memory schema: without ANALYZE data the
+    planner's choice depends only on the indexes, so the result is stable.
+    """
+    if queries is None:
+        from queries import PLAN_QUERIES as queries   # queries -> db -> migrations
+    if c is None:
+        c = sqlite3.connect(":memory:"); migrate(c)
+    return {k: s for k, (sql, p) in queries.items() if (s := full_scans(c, sql, p))}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("db", nargs="?", default="employees.db")
+    ap.add_argument("--check-plans", action="store_true")
+    a = ap.parse_args(argv)
+    c = sqlite3.connect(a.db)
+    before = version(c); after = migrate(c)
+    print(f"{a.db}: schema v{before} -> v{after}")
+    if a.check_plans:
+        bad = check_plans()
+        for k, s in bad.items(): print(f"FULL SCAN  {k}: {'; '.join(s)}")
+        if bad: return 1
+        from queries import PLAN_QUERIES
+        print(f"OK: {len(PLAN_QUERIES)} queries use an index")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
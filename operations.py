@@ -0,0 +1,44 @@
+"""Multi-statement and crew-level write operations.
+
+Each operation is one transaction and one set-based statement per table,
+whatever the number of workers involved.
+"""
+import json
+from db import transaction
+
+HISTORY = ("warnings", "accidents", "sick_hours", "ppe_events")
+
+# Also checked by queries.PLAN_QUERIES (migrations.py --check-plans).
+DELETE_HISTORY_SQL = "DELETE FROM {table} WHERE worker_id=?"
+TERMINATE_SQL = "UPDATE workers SET active=0,termination_date=? WHERE crew_id=? AND active=1"
+MOVE_SQL = """UPDATE workers SET crew_id=?,company_id=(SELECT company_id FROM crews WHERE id=?)
+              WHERE id IN (SELECT value FROM json_each(?))"""
+ISSUE_SQL = """INSERT INTO ppe_events(worker_id,item,action,date,qty,size,notes)
+               SELECT id,?,?,?,?,?,? FROM workers WHERE crew_id=? AND active=1{ids}"""
+ISSUE_IDS = " AND id IN (SELECT value FROM json_each(?))"
+MEMBERS_SQL = "SELECT id,full_name FROM workers WHERE crew_id=? AND active=1 ORDER BY full_name"
+
+def _ids(ids): return json.dumps([int(i) for i in ids])
+
+def delete_worker(wid):
+    """Delete a worker and all of their history atomically."""
+    with transaction() as tx:
+        for t in HISTORY: tx.exec(DELETE_HISTORY_SQL.format(table=t), (wid,))
+        return tx.exec("DELETE FROM workers WHERE id=?", (wid,)).rowcount
+
+def terminate_crew(crew_id, when):
+    """Give every active worker of the crew their termination (baja) on `when`."""
+    with transaction() as tx:
+        return tx.exec(TERMINATE_SQL, (str(when), crew_id)).rowcount
+
+def move_workers(ids, crew_id):
+    """Move the workers in `ids` to `crew_id` (and to that crew's company)."""
+    with transaction() as tx:
+        return tx.exec(MOVE_SQL, (crew_id, crew_id, _ids(ids))).rowcount
+
+def issue_ppe_to_crew(crew_id, item, action, when, qty=1.0, size=None, notes=None, ids=None):
+    """One ppe_events row per active crew member (or per worker in `ids`)."""
+    p = [crew_id] + ([_ids(ids)] if ids is not None else [])
+    with transaction() as tx:
+        return tx.exec(ISSUE_SQL.format(ids=ISSUE_IDS if ids is not None else ""),
+                       (item, action, str(when), float(qty), size, notes, *p)).rowcount
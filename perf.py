@@ -0,0 +1,119 @@
+"""Query and page timing, a slow-query log and Prometheus-style counters.
+
+Off unless EMPLOYEES_PERF=1. When off, db.q()/exec_sql()/to_dicts() only pay
+for one `if perf.ENABLED` check. When on:
+
+- every query is timed and counted (SQL text, parameter types, rows, cache hit),
+- to_dicts() adds the approximate size of the dicts it builds to its query
+  (Arrow results count their buffer size),
+- queries slower than SLOW_MS are appended to SLOW_LOG with EXPLAIN QUERY PLAN,
+- page renders are timed by start_page()/end_page(),
+- counters are written to METRICS_FILE (Prometheus text format).
+
+Parameter values are never recorded, only their types.
+"""
+import os, re, sys, threading, time
+from functools import lru_cache
+
+ENABLED = os.environ.get("EMPLOYEES_PERF", "") not in ("", "0")
+SLOW_MS = float(os.environ.get("EMPLOYEES_SLOW_MS", 250))
+SLOW_LOG = os.environ.get("EMPLOYEES_SLOW_LOG", "slow_queries.log")
+METRICS_FILE = os.environ.get("EMPLOYEES_METRICS", "metrics.prom")
+METRICS_EVERY = 5   # seconds between metrics file rewrites
+
+_lock = threading.Lock()
+_queries = {}   # (kind, sql) -> [count, seconds, rows, bytes, cache hits]
+_pages = {}     # page -> [renders, seconds]
+_local = threading.local()   # the current rerun (Streamlit runs each session in its own thread)
+_written = 0.0
+
+clock = time.perf_counter
+
+@lru_cache(maxsize=1024)
+def _sql(sql): return re.sub(r"\s+", " ", sql).strip()
+
+def shape(p): return ",".join(type(x).__name__ for x in p)
+
+def rerun():
+    """Records of the current rerun: dicts with kind, sql, shape, ms, rows, bytes, cached."""
+    return getattr(_local, "records", [])
+
+def record(kind, sql, p, t0, rows, cached=False, rows_obj=None):
+    ms = (clock() - t0) * 1000; s = _sql(sql)
+    n = getattr(rows_obj, "nbytes", 0)   # Arrow results: size of their buffers
+    r = {"kind": kind, "sql": s, "shape": shape(p), "ms": ms, "rows": rows, "bytes": n, "cached": cached}
+    if not hasattr(_local, "records"): _local.records = []
+    _local.records.append(r); _local.last = (r, id(rows_obj))
+    with _lock:
+        e = _queries.setdefault((kind, s), [0, 0.0, 0, 0, 0])
+        e[0] += 1; e[1] += ms / 1000; e[2] += rows; e[3] += n; e[4] += cached
+    if ms >= SLOW_MS and not cached: _slow(r, sql, p)
+
+def converted(rows, out):
+    """to_dicts() turned `rows` into `out`; charge the bytes to the query that fetched them."""
+    n = sum(sys.getsizeof(d) for d in out)
+    last = getattr(_local, "last", None)
+    if last and last[1] == id(rows):
+        r = last[0]
+    else:
+        r = {"kind": "to_dicts", "sql": "", "shape": "", "ms": 0.0, "rows": len(out), "bytes": 0, "cached": False}
+        if not hasattr(_local, "records"): _local.records = []
+        _local.records.append(r)
+    r["bytes"] += n
+    with _lock:
+        e = _queries.setdefault((r["kind"], r["sql"]), [0, 0.0, 0, 0, 0])
+        e[3] += n
+
+def _slow(r, sql, p):
+    import db
+    try:
+        with db.conn() as c: plan = [x[-1] for x in c.execute("EXPLAIN QUERY PLAN " + sql, p)]
+    except Exception as e:
+        plan = [f"(sin plan: {e})"]
+    page = getattr(_local, "page", None)
+    with _lock, open(SLOW_LOG, "a", encoding="utf-8") as f:
+        f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {r['ms']:.1f} ms rows={r['rows']} kind={r['kind']} "
+                f"page={page!r} params=({r['shape']})\n  {r['sql']}\n" + "".join(f"    {x}\n" for x in plan))
+
+def start_page(name):
+    _local.records = []; _local.last = None; _local.page = name; _local.t0 = clock()
+
+def end_page():
+    """Close the current page render; returns its duration in ms (None if none started)."""
+    t0 = getattr(_local, "t0", None)
+    if t0 is None: return None
+    ms = (clock() - t0) * 1000; _local.t0 = None
+    with _lock:
+        e = _pages.setdefault(_local.page, [0, 0.0]); e[0] += 1; e[1] += ms / 1000
+    if time.time() - _written >= METRICS_EVERY: write_metrics()
+    return ms
+
+def _label(s): return s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+def metrics():
+    """All counters in Prometheus text exposition format."""
+    with _lock:
+        qs = sorted(_queries.items()); ps = sorted(_pages.items())
+    out = []
+    for name, i, help_ in (("employees_queries_total", 0, "Queries run"),
+                           ("employees_query_seconds_total", 1, "Time spent in queries"),
+                           ("employees_query_rows_total", 2, "Rows returned"),
+                           ("employees_query_dict_bytes_total", 3, "Approximate bytes built by to_dicts() or held by Arrow results"),
+                           ("employees_query_cache_hits_total", 4, "Queries served from the cache")):
+        out += [f"# HELP {name} {help_}", f"# TYPE {name} counter"]
+        out += [f'{name}{{kind="{k}",sql="{_label(s)}"}} {v[i]:g}' for (k, s), v in qs]
+    for name, i, help_ in (("employees_page_renders_total", 0, "Page renders"),
+                           ("employees_page_seconds_total", 1, "Time spent rendering pages")):
+        out += [f"# HELP {name} {help_}", f"# TYPE {name} counter"]
+        out += [f'{name}{{page="{_label(p)}"}} {v[i]:g}' for p, v in ps]
+    return "\n".join(out) + "\n"
+
+def write_metrics(path=None):
+    """Rewrite the metrics file atomically (readers never see half a file)."""
+    global _written
+    path = path or METRICS_FILE; tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: f.write(metrics())
+    os.replace(tmp, path); _written = time.time()
+
+def reset():
+    with _lock: _queries.clear(); _pages.clear()
@@ -0,0 +1,187 @@
+"""Outstanding gloves/sleeves per worker, item and size, derived from ppe_events.
+
+The ledger is read in chunks into NumPy columns and reduced with
+np.unique/np.bincount; nothing loops over events in Python. The current
+balance starts from the last stored snapshot (ppe_balance_snapshot) and
+only folds in events added after it. Editing or deleting an event the
+snapshot already covers drops the snapshot (triggers, migration 6).
+"""
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+
+ITEMS = np.array(["gloves", "sleeves"])
+CHUNK = 50_000
+SNAPSHOT_EVERY = 5_000   # take a new snapshot once this many events sit after the last one
+SNAPSHOT_TABLES = {"ppe_balance_snapshot", "ppe_snapshot_meta"}   # what current() may write
+
+class Balances:
+    """Columnar (worker, item, size) -> qty table; `item` indexes ITEMS."""
+    def __init__(self, worker, item, size, qty):
+        self.worker, self.item, self.size, self.qty = worker, item, size, qty
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, object), np.zeros(0))
+
+    def __len__(self): return len(self.qty)
+
+    def __add__(self, other):
+        return reduce(*(np.concatenate([a, b]) for a, b in
+                        zip((self.worker, self.item, self.size, self.qty), (other.worker, other.item, other.size, other.qty))))
+
+    def nonzero(self):
+        m = np.abs(self.qty) > 1e-9
+        return Balances(self.worker[m], self.item[m], self.size[m], self.qty[m])
+
+    def per_worker(self):
+        """(worker ids, qty matrix [worker, item]) summed over sizes."""
+        ws, inv = np.unique(self.worker, return_inverse=True)
+        out = np.zeros((len(ws), len(ITEMS)))
+        np.add.at(out, (inv, self.item), self.qty)
+        return ws, out
+
+    def rows(self):
+        return list(zip(self.worker.tolist(), ITEMS[self.item].tolist(), self.size.tolist(), self.qty.tolist()))
+
+def reduce(worker, item, size, qty):
+    """Group-sum qty by (worker, item, size)."""
+    if len(qty) == 0: return Balances.empty()
+    sizes, s_idx = np.unique(size.astype(str), return_inverse=True)
+    key = (worker * len(ITEMS) + item) * len(sizes) + s_idx
+    uk, inv = np.unique(key, return_inverse=True)
+    tot = np.bincount(inv, weights=qty)
+    return Balances(uk // (len(ITEMS) * len(sizes)), (uk // len(sizes)) % len(ITEMS),
+                    sizes[uk % len(sizes)].astype(object), tot)
+
+def _columns(cur):
+    w, i, s, q = [], [], [], []
+    while True:
+        chunk = cur.fetchmany(CHUNK)
+        if not chunk: break
+        cw, ci, cs, cq = zip(*chunk)
+        w.append(np.fromiter(cw, np.int64, len(cw))); i.append(np.fromiter(ci, np.int64, len(ci)))
+        s.append(np.array(cs, dtype=object)); q.append(np.fromiter(cq, float, len(cq)))
+    if not w: return Balances.empty()
+    return reduce(*(np.concatenate(x) for x in (w, i, s, q)))
+
+def ledger(c, where="", p=()):
+    """Signed event quantities (issue +, return -) matching `where`, reduced."""
+    return _columns(c.execute(f"""SELECT worker_id, item='sleeves', coalesce(size,''),
+                                         CASE WHEN action='return' THEN -coalesce(qty,0) ELSE coalesce(qty,0) END
+                                  FROM ppe_events WHERE item IN ('gloves','sleeves') {where}""", p))
+
+def balances(c, start=None, end=None):
+    """Net movement between `start` and `end` (ISO dates, inclusive).
+    With no `start` this is the balance held as of `end`; with neither, the
+    current balance (served from the snapshot)."""
+    if start is None and end is None: return current(c)
+    where, p = "", []
+    if start: where += " AND date>=?"; p.append(str(start))
+    if end: where += " AND date<=?"; p.append(str(end))
+    return ledger(c, where, p)
+
+@contextmanager
+def _tx(c, begin="BEGIN"):
+    """One transaction around the block, so every read in it sees the same
+    database state. Joins the caller's transaction if one is already open."""
+    if c.in_transaction:
+        yield; return
+    c.execute(begin)
+    try:
+        yield
+        c.commit()
+    except BaseException:
+        c.rollback(); raise
+
+def _current(c):
+    # (balance, id it covers up to, events folded in after the snapshot)
+    meta = c.execute("SELECT max_event_id FROM ppe_snapshot_meta").fetchone()
+    last = meta[0] if meta else 0
+    # Bound everything by one MAX(id): rows inserted meanwhile by other
+    # sessions are left for the next call instead of being marked covered.
+    top = c.execute("SELECT coalesce(MAX(id),0) FROM ppe_events").fetchone()[0]
+    base = _columns(c.execute("SELECT worker_id, item='sleeves', size, qty FROM ppe_balance_snapshot")) if meta else Balances.empty()
+    pending = c.execute("SELECT COUNT(*) FROM ppe_events WHERE id>? AND id<=?", (last, top)).fetchone()[0]
+    return (base + ledger(c, " AND id>? AND id<=?", (last, top)) if pending else base), top, pending
+
+def current(c, snapshot_every=SNAPSHOT_EVERY):
+    """Current balance: last snapshot plus the events recorded after it.
+    May store a new snapshot, so open `c` with db.conn(SNAPSHOT_TABLES)
+    (a bare db.conn() would invalidate every cached query)."""
+    with _tx(c): bal, top, pending = _current(c)
+    if pending < snapshot_every: return bal
+    # Recompute under the write lock so the stored snapshot matches the state it covers.
+    with _tx(c, "BEGIN IMMEDIATE"):
+        bal, top, _ = _current(c); _store(c, bal, top)
+    return bal
+
+def snapshot(c):
+    """Recompute the balance from the whole ledger and store it as the new snapshot."""
+    with _tx(c, "BEGIN IMMEDIATE"):
+        top = c.execute("SELECT coalesce(MAX(id),0) FROM ppe_events").fetchone()[0]
+        bal = ledger(c, " AND id<=?", (top,)); _store(c, bal, top)
+    return bal
+
+def _store(c, bal, top):
+    bal = bal.nonzero()
+    c.execute("DELETE FROM ppe_balance_snapshot"); c.execute("DELETE FROM ppe_snapshot_meta")
+    c.executemany("INSERT INTO ppe_balance_snapshot(worker_id,item,size,qty) VALUES(?,?,?,?)", bal.rows())
+    c.execute("INSERT INTO ppe_snapshot_meta(max_event_id,taken_at) VALUES(?,?)", (top, datetime.now().isoformat(timespec="seconds")))
+
+def _align(keys, vals, ids, fill=0):
+    """vals[k] for each id where keys[k]==id (keys sorted), `fill` where absent."""
+    out = np.full((len(ids),) + vals.shape[1:], fill, dtype=vals.dtype)
+    if len(keys) == 0: return out
+    pos = np.minimum(np.searchsorted(keys, ids), len(keys) - 1)
+    hit = keys[pos] == ids
+    out[hit] = vals[pos[hit]]
+    return out
+
+def _held(issued, returned):
+    # Fixed columns say the item is held when issued and not returned on/after that date.
+    iss = issued != ""
+    return iss & ((returned == "") | (returned < issued))
+
+def mismatches(c, bal, worker_id=None):
+    """Workers whose fixed PPE columns disagree with the ledger balance
+    (only `worker_id` when given).
+
+    Returns (cols, rows) with one row per (worker, item) disagreement.
+    """
+    where, p = ("AND id=?", (worker_id,)) if worker_id is not None else ("", ())
+    r = c.execute(f"""SELECT id,full_name,coalesce(gloves_issued_date,''),coalesce(gloves_returned_date,''),
+                             coalesce(sleeves_issued_date,''),coalesce(sleeves_returned_date,'')
+                      FROM workers WHERE active=1 {where}""", p).fetchall()
+    cols = ["worker_id", "trabajador", "item", "ficha", "movimientos", "pendiente"]
+    if not r: return cols, []
+    ids = np.fromiter((x[0] for x in r), np.int64, len(r))
+    a = np.array([x[2:] for x in r], dtype=str)
+    fixed = np.stack([_held(a[:, 0], a[:, 1]), _held(a[:, 2], a[:, 3])], axis=1)
+    out_q = _align(*bal.per_worker(), ids)
+    bad = np.argwhere(fixed != (out_q > 1e-9))
+    names = [x[1] for x in r]
+    return cols, [(int(ids[k]), names[k], str(ITEMS[j]), "entregado" if fixed[k, j] else "sin entregar",
+                   "pendiente" if out_q[k, j] > 1e-9 else "sin pendiente", float(out_q[k, j])) for k, j in bad]
+
+def crew_outstanding(c, bal, crew_ids=None):
+    """(cols, rows): outstanding qty by crew, item and size, optionally only for `crew_ids`."""
+    b = bal.nonzero()
+    cols = ["company", "crew", "item", "size", "trabajadores", "pendiente"]
+    if not len(b): return cols, []
+    wk = np.array(c.execute("SELECT id,coalesce(crew_id,-1) FROM workers ORDER BY id").fetchall(), dtype=np.int64).reshape(-1, 2)
+    crews = _align(wk[:, 0], wk[:, 1], b.worker, fill=-1)
+    m = crews >= 0 if crew_ids is None else np.isin(crews, list(crew_ids))
+    crews, item, size, qty = crews[m], b.item[m], b.size[m], b.qty[m]
+    if not len(qty): return cols, []
+    sizes, s_idx = np.unique(size.astype(str), return_inverse=True)
+    key = (crews * len(ITEMS) + item) * len(sizes) + s_idx
+    uk, inv = np.unique(key, return_inverse=True)
+    tot = np.bincount(inv, weights=qty); n = np.bincount(inv)
+    labels = {i: (co, code) for i, co, code in c.execute(
+        "SELECT cr.id,c.name,cr.crew_code FROM crews cr JOIN companies c ON c.id=cr.company_id")}
+    rows = []
+    for k, t, cnt in zip(uk.tolist(), tot.tolist(), n.tolist()):
+        cr = k // (len(ITEMS) * len(sizes)); co, code = labels.get(cr, ("?", "?"))
+        rows.append((co, code, str(ITEMS[(k // len(sizes)) % len(ITEMS)]), str(sizes[k % len(sizes)]), cnt, t))
+    return cols, rows
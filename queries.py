@@ -0,0 +1,86 @@
+"""SQL issued by the pages, kept out of the UI modules so migrations.py
+--check-plans explains exactly what the app runs (PLAN_QUERIES)."""
+import db, operations, rosters, search
+
+WORKER_COUNT = "SELECT COUNT(*) FROM workers"
+CREWS_FOR_COMPANY = "SELECT id,crew_code,foreman_name FROM crews WHERE company_id=? ORDER BY crew_code"
+
+# Keyset-paginated histories: page -> (select, date-range where, count_from, order, totals).
+# `totals` is formatted with the final where (date range + filters); None when the page has none.
+HISTORY = {
+    "sick": ("""SELECT s.id,s.sick_date,s.hours,s.notes,w.full_name worker,c.name company,cr.crew_code crew
+                FROM sick_hours s JOIN workers w ON w.id=s.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+             "WHERE s.sick_date BETWEEN ? AND ?", "FROM sick_hours s JOIN workers w ON w.id=s.worker_id", ("s.sick_date", "s.id"),
+             """SELECT w.full_name worker,SUM(s.hours) total_hours FROM sick_hours s JOIN workers w ON w.id=s.worker_id
+                {where} GROUP BY s.worker_id ORDER BY w.full_name"""),
+    "warn": ("""SELECT wr.id,wr.warn_date,wr.warn_type,wr.notes,w.full_name worker,c.name company,cr.crew_code crew
+                FROM warnings wr JOIN workers w ON w.id=wr.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+             "WHERE wr.warn_date BETWEEN ? AND ?", "FROM warnings wr JOIN workers w ON w.id=wr.worker_id", ("wr.warn_date", "wr.id"),
+             """SELECT w.full_name worker,COUNT(*) total_warnings FROM warnings wr JOIN workers w ON w.id=wr.worker_id
+                {where} GROUP BY wr.worker_id ORDER BY total_warnings DESC, w.full_name"""),
+    "acc": ("""SELECT a.id,a.accident_date,a.injury_type,a.description,a.notes,w.full_name worker,c.name company,cr.crew_code crew
+               FROM accidents a JOIN workers w ON w.id=a.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+            "WHERE a.accident_date BETWEEN ? AND ?", "FROM accidents a JOIN workers w ON w.id=a.worker_id", ("a.accident_date", "a.id"),
+            """SELECT w.full_name worker,COUNT(*) total_accidents FROM accidents a JOIN workers w ON w.id=a.worker_id
+               {where} GROUP BY a.worker_id ORDER BY total_accidents DESC, w.full_name"""),
+    "ppe": ("""SELECT pe.id,pe.date,pe.item,pe.action,pe.qty,pe.size,pe.notes,w.full_name worker,c.name company,cr.crew_code crew
+               FROM ppe_events pe JOIN workers w ON w.id=pe.worker_id JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id""",
+            "WHERE pe.date BETWEEN ? AND ?", "FROM ppe_events pe JOIN workers w ON w.id=pe.worker_id", ("pe.date", "pe.id"), None),
+}
+PPE_ITEM, PPE_ACTION = " AND pe.item=?", " AND pe.action=?"
+
+# Historial trabajadores x cuadrilla; where is built from the filters below.
+CREW_HISTORY = """SELECT w.full_name trabajador,w.start_date alta,w.termination_date baja,
+                         CASE WHEN w.active=1 THEN 'Sí' ELSE 'No' END activo,
+                         c.name company,cr.crew_code crew,cr.foreman_name foreman,
+                         w.gloves_issued_date,w.gloves_returned_date,
+                         w.sleeves_issued_date,w.sleeves_returned_date,w.notes
+                  FROM workers w JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id
+                  {where} ORDER BY w.full_name"""
+CREW_COMPANY, CREW_CREW = " AND w.company_id=?", " AND w.crew_id=?"
+CREW_ACTIVE, CREW_INACTIVE = " AND w.active=1", " AND w.active=0 AND w.termination_date BETWEEN ? AND ?"
+
+DASH_WHERE, DASH_COMPANY = "WHERE r.month BETWEEN ? AND ?", " AND r.company_id=?"
+DASH_TREND = """SELECT r.month mes,SUM(r.sick_hours) sick_hours,SUM(r.warnings) warnings,SUM(r.accidents) accidentes,
+                       SUM(r.gloves_issued) gloves_entregados,SUM(r.sleeves_issued) sleeves_entregados
+                FROM rollup_monthly r {where} GROUP BY r.month ORDER BY r.month"""
+DASH_CREWS = """SELECT co.name company,cr.crew_code crew,COUNT(DISTINCT r.worker_id) trabajadores,
+                       SUM(r.sick_hours) sick_hours,SUM(r.warnings) warnings,SUM(r.accidents) accidentes,
+                       SUM(r.gloves_issued-r.gloves_returned) gloves_netos,SUM(r.sleeves_issued-r.sleeves_returned) sleeves_netos
+                FROM rollup_monthly r JOIN crews cr ON cr.id=r.crew_id JOIN companies co ON co.id=r.company_id
+                {where} GROUP BY r.crew_id ORDER BY sick_hours DESC"""
+
+def _plans():
+    """{check: (sql, params)}: each page's statements as issued, with the filters that narrow them most.
+    Lists that show a whole table by design (companies, all crews, all workers) are left out."""
+    cols, m, rng = "w.id,w.full_name,c.name,cr.crew_code", '"perez"*', ("2025-01-01", "2025-12-31")
+    found = search.FILTER.format(alias="w")
+    out = {"sidebar count": (WORKER_COUNT, ()),
+           "crews for company": (CREWS_FOR_COMPANY, (1,)),
+           "worker picker": (search.PICKER_SQL.format(cols=cols, order="w.full_name"), (300,)),
+           "buscar trabajador": (search.MATCH_SQL.format(cols=cols), (m, 300))}
+    for k, (sel, where, count_from, order, totals) in HISTORY.items():
+        out[f"historial {k}"] = (db.keyset_sql(sel, where, order), (*rng, 101))
+        out[f"historial {k} siguiente"] = (db.keyset_sql(sel, where, order, after=True), (*rng, "2025-06-01", 100, 101))
+        out[f"historial {k} busqueda"] = (db.keyset_sql(sel, where + found, order), (*rng, m, 101))
+        out[f"historial {k} conteo"] = (db.count_sql(count_from, where), rng)
+        out[f"historial {k} csv"] = (db.keyset_sql(sel, where, order, limit=False), rng)
+        if totals: out[f"historial {k} totales"] = (totals.format(where=where), rng)
+    sel, where, _, order, _ = HISTORY["ppe"]
+    out["historial ppe filtros"] = (db.keyset_sql(sel, where + PPE_ITEM + PPE_ACTION, order), (*rng, "gloves", "issue", 101))
+    out["cuadrilla historial"] = (CREW_HISTORY.format(where="WHERE 1=1" + CREW_COMPANY + CREW_CREW + CREW_ACTIVE), (1, 1))
+    out["cuadrilla bajas"] = (CREW_HISTORY.format(where="WHERE 1=1" + CREW_INACTIVE), rng)
+    out["cuadrilla listado"] = (rosters.ROSTER_SQL, (1, 1))
+    out["cuadrilla warnings"] = (rosters.WARN_SQL, (1, 1, "2025-01-01"))
+    out["dashboard tendencia"] = (DASH_TREND.format(where=DASH_WHERE + DASH_COMPANY), ("2025-01", "2025-12", 1))
+    out["dashboard cuadrillas"] = (DASH_CREWS.format(where=DASH_WHERE), ("2025-01", "2025-12"))
+    out["operaciones miembros"] = (operations.MEMBERS_SQL, (1,))
+    out["operaciones baja cuadrilla"] = (operations.TERMINATE_SQL, ("2025-06-01", 1))
+    out["operaciones mover"] = (operations.MOVE_SQL, (2, 2, "[1,2]"))
+    out["operaciones ppe cuadrilla"] = (operations.ISSUE_SQL.format(ids=operations.ISSUE_IDS),
+                                        ("gloves", "issue", "2025-06-01", 1.0, None, None, 1, "[1,2]"))
+    for t in operations.HISTORY:
+        out[f"borrar historial {t}"] = (operations.DELETE_HISTORY_SQL.format(table=t), (1,))
+    return out
+
+PLAN_QUERIES = _plans()
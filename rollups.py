@@ -0,0 +1,45 @@
+"""Rebuild and verify the trigger-maintained rollup_monthly table.
+
+    python rollups.py [path/to/employees.db] [--rebuild]
+
+Without --rebuild the rollups are only checked against the raw event tables.
+"""
+import sqlite3, sys, argparse
+from migrations import ROLLUP_MEASURES, rollup_source_sql
+
+COLS = f"worker_id,month,crew_id,company_id,{','.join(ROLLUP_MEASURES)}"
+
+def rebuild(c):
+    """Recompute every rollup row from scratch in one transaction; returns the row count."""
+    with c:
+        c.execute("DELETE FROM rollup_monthly")
+        c.execute(f"INSERT INTO rollup_monthly({COLS}) {rollup_source_sql()}")
+    return c.execute("SELECT COUNT(*) FROM rollup_monthly").fetchone()[0]
+
+def verify(c, tol=1e-6):
+    """(worker_id, month) keys whose stored rollup differs from the raw events."""
+    def load(sql):
+        return {(r[0], r[1]): r[2:] for r in c.execute(sql)}
+    stored = load(f"SELECT {COLS} FROM rollup_monthly")
+    fresh = load(rollup_source_sql())
+    bad = []
+    for k in stored.keys() | fresh.keys():
+        a, b = stored.get(k), fresh.get(k)
+        if a is None or b is None or a[:2] != b[:2] or any(abs((x or 0) - (y or 0)) > tol for x, y in zip(a[2:], b[2:])):
+            bad.append(k)
+    return sorted(bad)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("db", nargs="?", default="employees.db")
+    ap.add_argument("--rebuild", action="store_true")
+    a = ap.parse_args(argv)
+    c = sqlite3.connect(a.db)
+    if a.rebuild: print(f"rollup_monthly: {rebuild(c)} filas recalculadas")
+    bad = verify(c)
+    for k in bad[:20]: print(f"DIFERENCIA worker {k[0]} mes {k[1]}")
+    print("OK: rollups consistentes" if not bad else f"{len(bad)} filas inconsistentes (usa --rebuild)")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Printable crew rosters for every crew, rendered in parallel outside the UI.
+
+    python rosters.py [path/to/employees.db] [--out rosters.zip] [--format html|pdf] [--jobs N] [--since YYYY-MM-DD]
+
+Each worker process opens its own read-only connection and renders whole
+crews (roster, outstanding PPE from the ledger, warnings since --since); the
+parent only writes the returned files into one zip. PDF output needs
+weasyprint.
+"""
+import sqlite3, os, html, time, argparse, tempfile, zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+import db, ppe_balance
+
+# Same query as "Listado x cuadrilla (imprimible)".
+ROSTER_SQL = """SELECT w.id,w.full_name,w.start_date,w.active,w.gloves_issued_date,w.gloves_returned_date,w.sleeves_issued_date,w.sleeves_returned_date
+                FROM workers w WHERE w.company_id=? AND w.crew_id=? ORDER BY w.full_name"""
+CREWS_SQL = """SELECT cr.id,cr.company_id,c.name,cr.crew_code,cr.foreman_name FROM crews cr JOIN companies c ON c.id=cr.company_id
+               ORDER BY c.name,cr.crew_code"""
+WARN_SQL = """SELECT wr.worker_id,wr.warn_type FROM warnings wr JOIN workers w ON w.id=wr.worker_id
+              WHERE w.company_id=? AND w.crew_id=? AND wr.warn_date>=?"""
+
+def table_rows(rows, held):
+    """Roster rows (dicts from ROSTER_SQL) as printed; `held` maps worker id -> (gloves, sleeves) outstanding."""
+    return [{
+        "Trabajador":x["full_name"],"Alta":x["start_date"] or "","Activo":"Sí" if x["active"] else "No",
+        "Gloves entregados":x["gloves_issued_date"] or "","Gloves devueltos":x["gloves_returned_date"] or "",
+        "Sleeves entregados":x["sleeves_issued_date"] or "","Sleeves devueltos":x["sleeves_returned_date"] or "",
+        "Gloves pendientes":f'{held.get(x["id"],(0,0))[0]:g}',"Sleeves pendientes":f'{held.get(x["id"],(0,0))[1]:g}'
+    } for x in rows]
+
+CSS = """@page{size:letter landscape;margin:12mm}body{font:11px sans-serif}h1{font-size:16px;margin:0}
+h2{font-size:13px;margin:14px 0 4px}table{border-collapse:collapse;width:100%}th,td{border:1px solid #999;padding:2px 4px;text-align:left}
+th{background:#eee}.meta{color:#555;margin-bottom:8px}"""
+
+def _table(rows):
+    if not rows: return "<p>Sin registros.</p>"
+    e = html.escape; cols = list(rows[0])
+    return ("<table><tr>" + "".join(f"<th>{e(k)}</th>" for k in cols) + "</tr>"
+            + "".join("<tr>" + "".join(f"<td>{e(str(r[k]))}</td>" for k in cols) + "</tr>" for r in rows) + "</table>")
+
+_c = None   # this process's read-only connection
+
+def _init(path):
+    global _c
+    _c = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+def _render(job):
+    crew_id, company_id, company, code, foreman, fmt, since = job
+    cur = _c.execute(ROSTER_SQL, (company_id, crew_id)); cols = [d[0] for d in cur.description]
+    rows = db.to_dicts(cols, cur.fetchall())
+    bal = ppe_balance.ledger(_c, " AND worker_id IN (SELECT id FROM workers WHERE company_id=? AND crew_id=?)", (company_id, crew_id))
+    ws, qty = bal.per_worker(); held = dict(zip(ws.tolist(), qty.tolist()))
+    ppe = {}
+    for _, item, size, n in bal.nonzero().rows(): ppe[(item, size)] = ppe.get((item, size), 0) + n
+    warns, by_worker = {}, {}
+    for wid, t in _c.execute(WARN_SQL, (company_id, crew_id, since)):
+        warns[t or ""] = warns.get(t or "", 0) + 1; by_worker[wid] = by_worker.get(wid, 0) + 1
+    names = {x["id"]: x["full_name"] for x in rows}
+    e = html.escape
+    doc = (f"<!doctype html><html><head><meta charset='utf-8'><title>{e(company)} — {e(code)}</title><style>{CSS}</style></head><body>"
+           f"<h1>{e(company)} — {e(code)}</h1><div class='meta'>Foreman: {e(foreman or '')} · {len(rows)} trabajadores · "
+           f"generado {date.today().isoformat()}</div>"
+           + _table(table_rows(rows, held))
+           + "<h2>PPE pendiente (según movimientos)</h2>"
+           + _table([{"Item": i, "Talla": s, "Pendiente": f"{n:g}"} for (i, s), n in sorted(ppe.items())])
+           + f"<h2>Warnings desde {e(since)}</h2>"
+           + _table([{"Tipo": t, "Total": n} for t, n in sorted(warns.items())])
+           + _table([{"Trabajador": names.get(w, w), "Warnings": n} for w, n in sorted(by_worker.items(), key=lambda x: -x[1])])
+           + "</body></html>")
+    base = f"{company}_{code}".replace("/", "-").replace(" ", "_")
+    return (f"{base}.pdf", _pdf(doc)) if fmt == "pdf" else (f"{base}.html", doc.encode("utf-8"))
+
+def _pdf(doc):
+    from weasyprint import HTML
+    return HTML(string=doc).write_pdf()
+
+def build(path=None, out=None, fmt="html", jobs=None, since=None):
+    """Render every crew into the zip `out` (a temp file when None); returns (zip path, crews)."""
+    if fmt == "pdf":
+        try: import weasyprint   # noqa: F401
+        except ImportError: raise ValueError("Para PDF instala weasyprint (pip install weasyprint)")
+    path = os.path.abspath(path or db.DB)
+    since = since or (date.today() - timedelta(days=90)).isoformat()
+    c = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try: crews = c.execute(CREWS_SQL).fetchall()
+    finally: c.close()
+    work = [(*x, fmt, since) for x in crews]
+    if out is None:
+        fd, out = tempfile.mkstemp(suffix=".zip"); os.close(fd)
+    jobs = jobs or os.cpu_count() or 1
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        def write(files):
+            index = []
+            for name, data in files: zf.writestr(name, data); index.append(name)
+            zf.writestr("index.html", "<!doctype html><meta charset='utf-8'><ul>"
+                        + "".join(f"<li><a href='{html.escape(n)}'>{html.escape(n)}</a></li>" for n in index) + "</ul>")
+        if jobs == 1:
+            _init(path); write(map(_render, work))
+        else:
+            with ProcessPoolExecutor(jobs, initializer=_init, initargs=(path,)) as pool:
+                write(pool.map(_render, work, chunksize=max(1, len(work) // (jobs * 4))))
+    return out, len(work)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("db", nargs="?", default="employees.db")
+    ap.add_argument("--out", default="rosters.zip")
+    ap.add_argument("--format", choices=("html", "pdf"), default="html")
+    ap.add_argument("--jobs", type=int, help="worker processes (default: one per core)")
+    ap.add_argument("--since", help="warnings from this date (default: last 90 days)")
+    a = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    try: out, n = build(a.db, a.out, a.format, a.jobs, a.since)
+    except ValueError as e: ap.error(str(e))
+    print(f"{out}: {n} cuadrillas en {time.perf_counter() - t0:.2f} s")
+
+if __name__ == "__main__":
+    main()
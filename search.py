@@ -0,0 +1,55 @@
+"""Worker name search backed by the workers_fts FTS5 index (migration 3).
+
+Matching is accent-insensitive (the unicode61 tokenizer strips diacritics on
+both sides), every term is a prefix, and when nothing matches each term is
+swapped for its closest spellings in the index vocabulary.
+"""
+import re, difflib, unicodedata
+from db import q
+
+PICKER_JOINS = "JOIN companies c ON c.id=w.company_id JOIN crews cr ON cr.id=w.crew_id"
+PICKER_SQL = "SELECT {cols} FROM workers w " + PICKER_JOINS + " ORDER BY {order} LIMIT ?"
+MATCH_SQL = ("SELECT {cols} FROM workers_fts f JOIN workers w ON w.id=f.rowid " + PICKER_JOINS
+             + " WHERE workers_fts MATCH ? ORDER BY f.rank, w.full_name LIMIT ?")
+FILTER = " AND {alias}.id IN (SELECT rowid FROM workers_fts WHERE workers_fts MATCH ?)"
+
+def fold(s):
+    s = unicodedata.normalize("NFKD", s)
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).lower()
+
+def terms(text): return re.findall(r"\w+", fold(text or ""))
+
+def _expr(groups):
+    # groups: one list of alternatives per user term; terms are ANDed.
+    return " AND ".join("(" + " OR ".join(f'"{t}"*' for t in alts) + ")" for alts in groups)
+
+def _hits(expr):
+    _, r = q("SELECT 1 FROM workers_fts WHERE workers_fts MATCH ? LIMIT 1", (expr,))
+    return bool(r)
+
+def _close(term, n=3):
+    # Only compare against vocabulary sharing the first letter: typos rarely hit it
+    # and it keeps the candidate list small on large rosters.
+    _, r = q("SELECT term FROM workers_fts_vocab WHERE term>=? AND term<?", (term[0], term[0] + "￿"))
+    return difflib.get_close_matches(term, [x[0] for x in r], n=n, cutoff=0.7)
+
+def match(text):
+    """FTS5 MATCH expression for the user's text, or None when it has no terms."""
+    ts = terms(text)
+    if not ts: return None
+    expr = _expr([[t] for t in ts])
+    if _hits(expr): return expr
+    fuzzy = _expr([[t] + _close(t) for t in ts])
+    return fuzzy if fuzzy != expr else expr
+
+def worker_filter(text, alias="w"):
+    """(' AND ...', params) restricting `alias` to matching workers; empty when no search."""
+    m = match(text)
+    if m is None: return "", []
+    return FILTER.format(alias=alias), [m]
+
+def find_workers(text, cols="w.id,w.full_name,c.name,cr.crew_code", limit=300, order="w.full_name"):
+    """Worker picker rows: best matches first when searching, else `order`."""
+    m = match(text)
+    if m is None: return q(PICKER_SQL.format(cols=cols, order=order), (limit,))
+    return q(MATCH_SQL.format(cols=cols), (m, limit))
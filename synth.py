@@ -0,0 +1,93 @@
+"""Deterministic synthetic employees.db for load and benchmark runs.
+
+    python synth.py out.db [--scale N] [--companies N] [--crews N] [--workers N] [--years N] [--seed N]
+
+The defaults mirror the shipped database (3 companies, 9 crews, 310 workers)
+with a year of events at the per-worker rates in RATES; --scale multiplies
+crews and workers. The same arguments always produce the same rows.
+"""
+import sqlite3, os, random, argparse, time
+from datetime import date, timedelta
+import migrations
+
+END = date(2025, 12, 31)   # fixed, so the output does not depend on today
+# Events per worker and year.
+RATES = {"sick_hours": 8, "warnings": 1, "accidents": 0.1, "ppe_events": 4}
+BATCH = 20_000
+
+LAST = ["GARCIA","MARTINEZ","HERNANDEZ","LOPEZ","GONZALEZ","PEREZ","SANCHEZ","RAMIREZ","CRUZ","FLORES",
+        "GOMEZ","MORALES","VAZQUEZ","REYES","JIMENEZ","TORRES","DIAZ","GUTIERREZ","RUIZ","MENDOZA","NUÑEZ","MUÑOZ"]
+FIRST = ["JOSÉ","MARÍA","JUAN","ANA","LUIS","CARMEN","JESÚS","ROSA","PEDRO","MARTHA","RAÚL","SOFÍA","ÁNGEL","INÉS"]
+WARN_TYPES = ["no_safety_glasses", "low_production", "late", "other"]
+INJURIES = ["corte", "golpe", "espina", "torcedura", "other"]
+SIZES = ["S", "M", "L", "XL", "9", "10"]
+
+def _batches(it, n=BATCH):
+    b = []
+    for x in it:
+        b.append(x)
+        if len(b) >= n: yield b; b = []
+    if b: yield b
+
+def generate(path, companies=3, crews=9, workers=310, years=1, seed=1, rates=RATES, end=END):
+    """Create `path` (must not exist) with the given volumes; returns {table: rows}."""
+    if os.path.exists(path): raise FileExistsError(path)
+    rnd = random.Random(seed)
+    c = sqlite3.connect(path)
+    try:
+        c.execute("PRAGMA journal_mode=OFF"); c.execute("PRAGMA synchronous=OFF")   # throwaway file until done
+        migrations.migrate(c)
+        days = 365 * years
+        day = lambda: (end - timedelta(days=rnd.randrange(days))).isoformat()
+        with c:
+            c.executemany("INSERT INTO companies(id,name) VALUES(?,?)", ((i, f"COMPANY {i:02d}") for i in range(1, companies + 1)))
+            c.executemany("INSERT INTO crews(id,company_id,crew_code,foreman_name) VALUES(?,?,?,?)",
+                          ((i, (i - 1) % companies + 1, f"CREW {i:03d}", f"{rnd.choice(FIRST)} {rnd.choice(LAST)}") for i in range(1, crews + 1)))
+            def people():
+                for i in range(1, workers + 1):
+                    crew = rnd.randrange(crews) + 1; start = day(); active = rnd.random() > .1
+                    g = start if rnd.random() < .9 else None; s = start if rnd.random() < .5 else None
+                    yield (i, f"{rnd.choice(LAST)} {rnd.choice(LAST)}, {rnd.choice(FIRST)}", (crew - 1) % companies + 1, crew,
+                           start, None if active else max(start, day()), int(active), g, s)
+            for b in _batches(people()):
+                c.executemany("""INSERT INTO workers(id,full_name,company_id,crew_id,start_date,termination_date,active,
+                                 gloves_issued_date,sleeves_issued_date) VALUES(?,?,?,?,?,?,?,?,?)""", b)
+        w = lambda: rnd.randrange(workers) + 1
+        n = lambda t: round(rates[t] * workers * years)
+        events = {
+            "sick_hours": ("worker_id,sick_date,hours,notes",
+                           lambda: (w(), day(), rnd.choice((4.0, 8.0, 8.0, 10.0)), "nota de prueba " * rnd.randint(0, 3) or None)),
+            "warnings": ("worker_id,warn_date,warn_type,notes", lambda: (w(), day(), rnd.choice(WARN_TYPES), None)),
+            "accidents": ("worker_id,accident_date,injury_type,description,notes",
+                          lambda: (w(), day(), rnd.choice(INJURIES), "descripción de prueba", None)),
+            # Two issues per return, so balances stay positive on average.
+            "ppe_events": ("worker_id,item,action,date,qty,size,notes",
+                           lambda: (w(), rnd.choice(("gloves", "sleeves")), rnd.choice(("issue", "issue", "return")),
+                                    day(), 1.0, rnd.choice(SIZES), None)),
+        }
+        for t, (cols, row) in events.items():
+            sql = f"INSERT INTO {t}({cols}) VALUES({','.join('?' * len(cols.split(',')))})"
+            for b in _batches(row() for _ in range(n(t))):
+                with c: c.executemany(sql, b)
+        c.execute("ANALYZE")
+        return {t: c.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                for t in ("companies", "crews", "workers", *events)}
+    finally:
+        c.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("out")
+    ap.add_argument("--scale", type=float, default=1, help="multiplies --crews and --workers")
+    ap.add_argument("--companies", type=int, default=3)
+    ap.add_argument("--crews", type=int, default=9)
+    ap.add_argument("--workers", type=int, default=310)
+    ap.add_argument("--years", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=1)
+    a = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    n = generate(a.out, a.companies, max(1, round(a.crews * a.scale)), max(1, round(a.workers * a.scale)), a.years, a.seed)
+    print(f"{a.out}: " + ", ".join(f"{k} {v}" for k, v in n.items()) + f" ({time.perf_counter() - t0:.1f} s)")
+
+if __name__ == "__main__":
+    main()
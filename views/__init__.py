@@ -0,0 +1,32 @@
+"""Menu pages, one module each.
+
+A page's module (and whatever it imports: export, backup, importer, ...) is
+loaded the first time the page is opened, not on every rerun of the app.
+Not named pages/: Streamlit would treat that as a multipage app.
+"""
+import importlib
+
+# Menu label -> module, in menu order.
+PAGES = {
+    "Compañías y Cuadrillas": "companies",
+    "Trabajadores (Alta/Edición)": "workers",
+    "Sick Hours (Registro)": "sick_entry",
+    "Historial Sick Hours": "sick_history",
+    "PPE (Gloves/Sleeves & Bajas)": "ppe_fixed",
+    "PPE Movimientos (historial)": "ppe_events",
+    "PPE pendientes x cuadrilla": "ppe_outstanding",
+    "Warnings": "warning_entry",
+    "Historial Warnings": "warnings_history",
+    "Accidentes": "accident_entry",
+    "Historial Accidentes": "accidents_history",
+    "Historial trabajadores x cuadrilla": "crew_history",
+    "Listado x cuadrilla (imprimible)": "crew_roster",
+    "Dashboard": "dashboard",
+    "Operaciones por cuadrilla": "crew_ops",
+    "Importar (CSV/XLSX)": "imports",
+    "Respaldos (Backup/Restore)": "backups",
+    "Exportar CSV": "exports",
+}
+
+def render(label):
+    importlib.import_module(f"{__name__}.{PAGES[label]}").render()
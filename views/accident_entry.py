@@ -0,0 +1,23 @@
+"""Accidentes: record an accident."""
+import streamlit as st
+from datetime import date
+import search
+from db import exec_sql
+
+def render():
+    st.subheader("Registrar Accidente")
+    s=st.text_input("Buscar trabajador",value="")
+    c,r=search.find_workers(s)
+    opts=[f"{x[0]} — {x[1]} ({x[2]}/{x[3]})" for x in r]
+    sel=st.selectbox("Trabajador",opts) if opts else None; wid=int(sel.split(" — ")[0]) if sel else None
+    a,b=st.columns(2)
+    with a:
+        d=st.date_input("Fecha", value=date.today())
+        inj=st.text_input("Tipo de lesión")
+    with b:
+        desc=st.text_area("Descripción")
+        notes=st.text_input("Notas (opcional)")
+    if st.button("➕ Guardar accidente", disabled=(wid is None)):
+        if not inj.strip(): st.warning("Escribe el tipo de lesión.")
+        else:
+            exec_sql("INSERT INTO accidents(worker_id,accident_date,injury_type,description,notes) VALUES(?,?,?,?,?)",(wid,str(d),inj,desc.strip() or None,notes.strip() or None)); st.success("Guardado.")
@@ -0,0 +1,22 @@
+"""Respaldos (Backup/Restore): online backup and verified restore."""
+import streamlit as st
+import os
+from datetime import datetime
+import db, backup
+from views.common import lazy_download
+
+def render():
+    st.subheader("📦 Crear respaldo (.zip)")
+    if os.path.exists(db.DB):
+        st.caption("Copia consistente de la base en uso; se genera al pulsar el botón.")
+        lazy_download(":arrow_down: Descargar respaldo","backup",backup.backup_zip,
+                      f"backup_employees_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip","application/zip")
+    st.markdown("---")
+    st.subheader("⬆️ Restaurar desde ZIP")
+    up=st.file_uploader("Sube un ZIP que contenga employees.db", type=["zip"])
+    if up is not None and st.button("⚠️ Restaurar (reemplaza la base actual)"):
+        try:
+            backup.restore_zip(up)
+            st.success("Base restaurada. Recarga la app.")
+        except Exception as e:
+            st.error(f"Error: {e}")
@@ -0,0 +1,71 @@
+"""UI helpers shared by the pages."""
+import streamlit as st
+import os, shutil, tempfile, time
+import db, queries
+from db import q
+
+def company_select(lbl="Compañía", key=None):
+    _,r=q("SELECT id,name FROM companies ORDER BY name")
+    opts=[("— seleccionar —",-1)]+[(x[1],x[0]) for x in r]
+    lab=st.selectbox(lbl,[x[0] for x in opts], key=key)
+    return dict(opts).get(lab,-1)
+
+def crews_for_company(cid):
+    if cid<=0: return []
+    _,r=q(queries.CREWS_FOR_COMPANY,(cid,))
+    return r
+
+PAGE_SIZES=[50,100,250,500]
+
+def paged_history(key, select, where, p, order, count_from):
+    """Keyset-paginated table (order DESC) with page controls; returns the total row count."""
+    size=st.selectbox("Filas por página",PAGE_SIZES,index=1,key=f"pgsize_{key}")
+    sig=(select,where,tuple(p),size)
+    pg=st.session_state.setdefault(f"pg_{key}",{"sig":None})
+    if pg["sig"]!=sig: pg.update(sig=sig,cursors=[None])   # filters changed: back to page 1
+    total=db.count(count_from,where,p)
+    t=db.keyset_page(select,where,p,order,size,pg["cursors"][-1],arrow=True)
+    more=t.num_rows>size; t=t.slice(0,size)
+    st.dataframe(t,use_container_width=True)
+    n=len(pg["cursors"]); pages=max(1,-(-total//size))
+    a,b,cx=st.columns([1,2,1])
+    if a.button("◀ Anterior",key=f"prev_{key}",disabled=n==1):
+        pg["cursors"].pop(); st.rerun()
+    b.caption(f"Registros: {total} · Página {n} de {pages}")
+    if cx.button("Siguiente ▶",key=f"next_{key}",disabled=not more):
+        dk,ik=(x.split(".")[-1] for x in order)
+        pg["cursors"].append((t[dk][-1].as_py(),t[ik][-1].as_py())); st.rerun()
+    return total
+
+DL_DIR=os.path.join(tempfile.gettempdir(),"employees_downloads")
+DL_MAX_AGE=3600   # seconds; anything older in DL_DIR was left behind by a crash
+
+def _sweep():
+    now=time.time()
+    for e in os.scandir(DL_DIR):
+        try:
+            if now-e.stat().st_mtime>DL_MAX_AGE:
+                shutil.rmtree(e.path) if e.is_dir() else os.remove(e.path)
+        except OSError: pass
+
+def lazy_download(label, key, build, file_name, mime):
+    """Download button whose file is built only when it is clicked.
+
+    `build(dir=...)` writes a temp file in DL_DIR and returns its path; the
+    file is read for Streamlit and deleted right away. Nothing is built or
+    read on reruns, but the finished file is held in memory for the download."""
+    def data():
+        os.makedirs(DL_DIR,exist_ok=True); _sweep()
+        path=build(dir=DL_DIR)
+        try:
+            with open(path,"rb") as fh: return fh.read()
+        finally: os.remove(path)
+    st.download_button(label,data=data,file_name=file_name,mime=mime,key=f"get_{key}")
+
+def csv_download(label, sql, p, base, key):
+    """Full result of `sql` as a streamed CSV (optionally gzip), built on request."""
+    import export
+    comp=st.radio("Formato",[None,"gzip"],format_func=lambda x:"CSV" if x is None else "CSV.gz",
+                  horizontal=True,key=f"fmt_{key}")
+    lazy_download(label,key,lambda dir:export.csv_file(sql,p,comp,base,dir),
+                  export.file_name(base,comp),export.mime(comp))
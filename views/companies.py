@@ -0,0 +1,26 @@
+"""Compañías y Cuadrillas: add companies and crews."""
+import streamlit as st
+import sqlite3
+from db import exec_sql
+from views.common import company_select
+
+def render():
+    st.subheader("Compañías")
+    name=st.text_input("Nueva compañía")
+    if st.button("➕ Agregar compañía"):
+        if name.strip():
+            try: exec_sql("INSERT INTO companies(name) VALUES(?)",(name.strip(),)); st.success("Agregada.")
+            except sqlite3.IntegrityError: st.error("Ya existe.")
+        else: st.warning("Escribe un nombre.")
+    st.markdown("---"); st.subheader("Cuadrillas")
+    cid=company_select()
+    c1,c2,c3=st.columns(3)
+    with c1: code=st.text_input("Crew Code")
+    with c2: fore=st.text_input("Foreman (Mayordomo)")
+    with c3:
+        if st.button("➕ Agregar cuadrilla"):
+            if cid<=0: st.warning("Selecciona compañía.")
+            elif not code.strip(): st.warning("Escribe Crew Code.")
+            else:
+                try: exec_sql("INSERT INTO crews(company_id,crew_code,foreman_name) VALUES(?,?,?)",(cid,code.strip(),fore.strip())); st.success("Agregada.")
+                except sqlite3.IntegrityError: st.error("Duplicada para esa compañía.")
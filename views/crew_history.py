@@ -0,0 +1,33 @@
+"""Historial trabajadores x cuadrilla: workers by company/crew and status."""
+import streamlit as st
+from datetime import date
+import queries
+from db import q
+from views.common import company_select, crews_for_company, csv_download
+
+def render():
+    st.subheader("Historial de trabajadores por cuadrilla")
+    cid = company_select("Compañía")
+    crew_id = -1
+    if cid>0:
+        crews = crews_for_company(cid)
+        if not crews: st.info("Esta compañía no tiene cuadrillas registradas.")
+        else:
+            labels = [f"{x[1]} — {x[2] or ''}" for x in crews]
+            lab = st.selectbox("Cuadrilla", labels)
+            crew_id = crews[labels.index(lab)][0]
+    c1,c2,c3 = st.columns([1.2,1,1])
+    with c1: status = st.selectbox("Mostrar", ["Activos","Inactivos","Todos"])
+    with c2: dfrom = st.date_input("Desde (para bajas)", value=date(2025,1,1))
+    with c3: dto = st.date_input("Hasta (para bajas)", value=date.today())
+    where="WHERE 1=1"; p=[]
+    if cid>0: where+=queries.CREW_COMPANY; p.append(cid)
+    if crew_id>0: where+=queries.CREW_CREW; p.append(crew_id)
+    if status=="Activos":
+        where+=queries.CREW_ACTIVE
+    elif status=="Inactivos":
+        where+=queries.CREW_INACTIVE; p.extend([str(dfrom),str(dto)])
+    sql=queries.CREW_HISTORY.format(where=where)
+    rows=q(sql,tuple(p),arrow=True)
+    st.dataframe(rows,use_container_width=True); st.caption(f"Registros: {rows.num_rows}")
+    if rows.num_rows: csv_download("CSV listado x cuadrilla", sql, p, "listado_cuadrilla", "cuadrilla")
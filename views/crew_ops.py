@@ -0,0 +1,42 @@
+"""Operaciones por cuadrilla: crew-level PPE, move and termination in one transaction each."""
+import streamlit as st
+from datetime import date
+import operations
+from db import q
+from views.common import company_select, crews_for_company
+
+def render():
+    st.subheader("Operaciones masivas por cuadrilla")
+    cid=company_select(key="ops_comp"); crews=crews_for_company(cid)
+    if cid<=0 or not crews: st.info("Selecciona compañía/cuadrilla con datos.")
+    else:
+        labels=[f"{x[1]} — {x[2] or ''}" for x in crews]
+        lab=st.selectbox("Cuadrilla",labels,key="ops_crew"); crew_id=crews[labels.index(lab)][0]
+        _,members=q(operations.MEMBERS_SQL,(crew_id,))
+        st.caption(f"👥 Activos en la cuadrilla: {len(members)}")
+        t1,t2,t3=st.tabs(["Entregar/recibir PPE","Mover trabajadores","Dar de baja a la cuadrilla"])
+        with t1:
+            a,b,cx,dx=st.columns(4)
+            item=a.selectbox("Item",["gloves","sleeves"],key="ops_item"); action=b.selectbox("Acción",["issue","return"],key="ops_act")
+            d=cx.date_input("Fecha",value=date.today(),key="ops_date")
+            qty=dx.number_input("Cantidad (pares)",min_value=0.0,step=1.0,value=1.0,format="%.0f",key="ops_qty")
+            size=(st.selectbox("Talla (gloves)",["","8.5","9","9.5","10","10.5","11","11.5","12"],key="ops_size") or None) if item=="gloves" else None
+            notes=st.text_input("Notas (opcional)",key="ops_notes")
+            if st.button(f"Registrar para los {len(members)} activos",disabled=not members):
+                n=operations.issue_ppe_to_crew(crew_id,item,action,d,qty,size,notes.strip() or None)
+                st.success(f"{n} movimientos registrados.")
+        with t2:
+            _,all_crews=q("SELECT cr.id,c.name,cr.crew_code FROM crews cr JOIN companies c ON c.id=cr.company_id ORDER BY c.name,cr.crew_code")
+            dest=[x for x in all_crews if x[0]!=crew_id]
+            names={x[0]:x[1] for x in members}
+            ids=st.multiselect("Trabajadores",list(names),default=list(names),format_func=names.get)
+            to=st.selectbox("Cuadrilla destino",dest,format_func=lambda x:f"{x[1]} / {x[2]}") if dest else None
+            if st.button(f"Mover {len(ids)} trabajadores",disabled=not ids or to is None):
+                n=operations.move_workers(ids,to[0]); st.success(f"{n} trabajadores movidos.")
+        with t3:
+            d=st.date_input("Fecha de baja",value=date.today(),key="ops_term")
+            conf=st.text_input("Escribe BAJA para confirmar",key=f"ops_conf_{crew_id}")
+            if st.button(f"✋ Dar de baja a {len(members)} trabajadores",disabled=not members):
+                if conf.strip().upper()=="BAJA":
+                    n=operations.terminate_crew(crew_id,d); st.success(f"Baja aplicada a {n} trabajadores.")
+                else: st.warning("Confirmación incorrecta.")
@@ -0,0 +1,17 @@
+"""Listado x cuadrilla (imprimible): one crew's printable roster."""
+import streamlit as st
+import db, ppe_balance, rosters
+from db import q, to_dicts
+from views.common import company_select, crews_for_company
+
+def render():
+    st.subheader("Listado por cuadrilla (vista para impresión)")
+    cid=company_select(); crews=crews_for_company(cid)
+    if cid<=0 or not crews: st.info("Selecciona compañía/cuadrilla con datos.")
+    else:
+        lab=st.selectbox("Cuadrilla",[f"{x[1]} — {x[2] or ''}" for x in crews])
+        crew_id=crews[[f"{x[1]} — {x[2] or ''}" for x in crews].index(lab)][0]
+        c,r=q(rosters.ROSTER_SQL,(cid,crew_id))
+        with db.conn(ppe_balance.SNAPSHOT_TABLES) as cx: ws,held=ppe_balance.current(cx).per_worker()
+        st.table(rosters.table_rows(to_dicts(c,r),dict(zip(ws.tolist(),held.tolist()))))
+        st.caption("Usa Ctrl+P para imprimir. El paquete de todas las cuadrillas se genera con `python rosters.py`.")
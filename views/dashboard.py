@@ -0,0 +1,38 @@
+"""Dashboard: trends and crew comparison, read only from rollup_monthly."""
+import streamlit as st
+from datetime import date
+import db, queries, rollups
+from db import q, to_dicts
+from views.common import company_select
+
+def render():
+    st.subheader("📊 Dashboard")
+    a,b=st.columns(2); fm=a.date_input("Desde (mes)",value=date(date.today().year,1,1)); tm=b.date_input("Hasta (mes)",value=date.today())
+    cid=company_select("Compañía (opcional)",key="dash_comp")
+    where=queries.DASH_WHERE; p=[str(fm)[:7],str(tm)[:7]]
+    if cid>0: where+=queries.DASH_COMPANY; p.append(cid)
+    c,r=q(queries.DASH_TREND.format(where=where),tuple(p))
+    trend=to_dicts(c,r)
+    if not trend: st.info("Sin registros en el periodo.")
+    else:
+        k1,k2,k3=st.columns(3)
+        k1.metric("Sick hours",f"{sum(x['sick_hours'] for x in trend):,.1f}")
+        k2.metric("Warnings",sum(x["warnings"] for x in trend)); k3.metric("Accidentes",sum(x["accidentes"] for x in trend))
+        cols={k:[x[k] for x in trend] for k in c}
+        st.markdown("**Tendencia mensual**")
+        st.line_chart(cols,x="mes",y=["sick_hours"])
+        st.bar_chart(cols,x="mes",y=["warnings","accidentes"])
+        c,r=q(queries.DASH_CREWS.format(where=where),tuple(p))
+        crews=to_dicts(c,r)
+        st.markdown("**Comparativo por cuadrilla**")
+        st.bar_chart({"crew":[f"{x['company']} / {x['crew']}" for x in crews],"sick_hours":[x["sick_hours"] for x in crews]},x="crew",y="sick_hours")
+        st.dataframe(crews,use_container_width=True)
+    with st.expander("Mantenimiento de resúmenes"):
+        a,b=st.columns(2)
+        if a.button("Verificar"):
+            with db.conn() as cx: bad=rollups.verify(cx)
+            if bad: st.error(f"{len(bad)} filas inconsistentes.")
+            else: st.success("Resúmenes consistentes.")
+        if b.button("Recalcular desde cero"):
+            with db.conn({"rollup_monthly"}) as cx: n=rollups.rebuild(cx)
+            st.success(f"{n} filas recalculadas.")
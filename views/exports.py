@@ -0,0 +1,26 @@
+"""Exportar CSV: streamed per-table and all-tables exports, plus partitioned Parquet."""
+import streamlit as st
+from datetime import datetime
+import export
+from db import q
+from views.common import lazy_download
+
+def render():
+    st.subheader("Exportar tablas a CSV")
+    st.caption("Los archivos se generan al pulsar el botón de descarga, leyendo la base por bloques.")
+    comp=st.radio("Formato",[None,"gzip","zip"],format_func=lambda x:{None:"CSV","gzip":"CSV.gz","zip":"ZIP"}[x],horizontal=True)
+    for n,sql in export.TABLES:
+        try:
+            st.write(f"**{n}** — {q(f'SELECT COUNT(*) FROM {n}')[1][0][0]} filas")
+            lazy_download(f"CSV — {n}",f"exp_{n}",lambda dir,sql=sql,n=n:export.csv_file(sql,(),comp,n,dir),
+                          export.file_name(n,comp),export.mime(comp))
+        except Exception as e:
+            st.write(f"{n}: (no disponible) {e}")
+    st.markdown("---")
+    lazy_download("todas las tablas (.zip)","exp_all",export.archive,
+                  f"employees_csv_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip","application/zip")
+    st.markdown("---"); st.subheader("Parquet para analítica")
+    st.caption("Tablas de eventos (sick_hours, warnings, accidents, ppe_events) particionadas por año/mes: "
+               "tabla/year=AAAA/month=MM/part-0.parquet.")
+    lazy_download("eventos en Parquet (.zip)","exp_parquet",export.parquet_zip,
+                  f"employees_parquet_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip","application/zip")
@@ -0,0 +1,29 @@
+"""Importar (CSV/XLSX): bulk import through importer.py."""
+import streamlit as st
+import os
+import importer
+
+def render():
+    st.subheader("📥 Importación masiva (CSV/XLSX)")
+    labels={"workers":"Trabajadores","sick_hours":"Sick hours","warnings":"Warnings","ppe_events":"Movimientos PPE"}
+    kind=st.selectbox("Tipo de datos",list(importer.KINDS),format_func=labels.get)
+    _,req,opt,_=importer.KINDS[kind]
+    who="" if kind=="workers" else "worker_id **o** worker (nombre; añade company/crew si hay homónimos), "
+    st.caption(f"Columnas: {who}{', '.join(f'**{x}**' for x in req)}; opcionales: {', '.join(opt)}. "
+               "Fechas AAAA-MM-DD o MM/DD/AAAA. Las filas ya importadas se omiten.")
+    up=st.file_uploader("Archivo", type=["csv","xlsx"])
+    if up is not None and st.button("📥 Importar"):
+        try:
+            with st.spinner("Importando..."): res=importer.import_file(kind,up,up.name)
+            if res["error_file"]:   # keep the report in the session, not in the temp dir
+                with open(res["error_file"],"rb") as fh: res["error_csv"]=fh.read()
+                os.remove(res["error_file"])
+            st.session_state["import_res"]=res
+        except ValueError as e: st.error(f"Error: {e}")
+    res=st.session_state.get("import_res")
+    if res:
+        a,b,cx,dx=st.columns(4)
+        a.metric("Leídas",res["read"]); b.metric("Insertadas",res["inserted"])
+        cx.metric("Duplicadas (omitidas)",res["duplicates"]); dx.metric("Con error",res["errors"])
+        if res.get("error_csv"):
+            st.download_button("CSV de errores",data=res["error_csv"],file_name="import_errores.csv",mime="text/csv")
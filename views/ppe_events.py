@@ -0,0 +1,35 @@
+"""PPE Movimientos (historial): record PPE issues/returns and browse the ledger."""
+import streamlit as st
+from datetime import date
+import db, queries, search
+from db import exec_sql
+from views.common import paged_history, csv_download
+
+def render():
+    st.subheader("Movimientos PPE (issue/return) — con talla para gloves")
+    s=st.text_input("Buscar trabajador",value="")
+    c,r=search.find_workers(s, limit=500)
+    opts=[f"{x[0]} - {x[1]} ({x[2]}/{x[3]})" for x in r]
+    sel=st.selectbox("Trabajador",opts) if opts else None; wid=int(sel.split(" - ")[0]) if sel else None
+
+    a,b,cx,dx=st.columns(4)
+    with a: item=st.selectbox("Item",["gloves","sleeves"])
+    with b: action=st.selectbox("Acción",["issue","return"])
+    with cx: d=st.date_input("Fecha", value=date.today())
+    with dx: qty=st.number_input("Cantidad (pares)", min_value=0.0, step=1.0, value=1.0, format="%.0f")
+    size=None
+    if item=="gloves": size=st.selectbox("Talla (gloves)",["","8.5","9","9.5","10","10.5","11","11.5","12"]) or None
+    notes=st.text_input("Notas (opcional)")
+    if st.button("Guardar movimiento", disabled=(wid is None)):
+        exec_sql("INSERT INTO ppe_events(worker_id,item,action,date,qty,size,notes) VALUES(?,?,?,?,?,?,?)",(wid,item,action,str(d),float(qty),size,notes.strip() or None)); st.success("Guardado.")
+
+    st.markdown("---"); st.subheader("Historial / Filtros")
+    s2=st.text_input("Buscar (nombre contiene)",value="")
+    f1,f2,f3,f4=st.columns(4); fd=f1.date_input("Desde",value=date(2025,1,1)); td=f2.date_input("Hasta",value=date.today())
+    item_f=f3.selectbox("Item filtro",["(todos)","gloves","sleeves"]); act_f=f4.selectbox("Acción filtro",["(todas)","issue","return"])
+    sel,where,count_from,order,_=queries.HISTORY["ppe"]; p=[str(fd),str(td)]
+    fs,fp=search.worker_filter(s2); where+=fs; p+=fp
+    if item_f!="(todos)": where+=queries.PPE_ITEM; p.append(item_f)
+    if act_f!="(todas)": where+=queries.PPE_ACTION; p.append(act_f)
+    n=paged_history("ppe",sel,where,p,order,count_from)
+    if n: csv_download("CSV PPE", db.keyset_sql(sel,where,order,limit=False), p, "ppe_historial", "ppe")
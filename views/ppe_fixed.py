@@ -0,0 +1,47 @@
+"""PPE (Gloves/Sleeves & Bajas): the fixed PPE date columns on workers."""
+import streamlit as st
+from datetime import date
+import db, search, ppe_balance
+from db import exec_sql
+
+def render():
+    st.subheader("Registrar/Editar entrega y devolución de Gloves y Sleeves (campos fijos)")
+    s=st.text_input("Buscar trabajador",value="")
+    c,r=search.find_workers(s, cols="w.id,w.full_name,c.name,cr.crew_code,gloves_issued_date,gloves_returned_date,sleeves_issued_date,sleeves_returned_date",
+                            limit=400)
+    opts=[f"{x[0]} - {x[1]} ({x[2]}/{x[3]})" for x in r]
+    sel=st.selectbox("Trabajador",opts) if opts else None; wid=int(sel.split(" - ")[0]) if sel else None
+
+    if wid:
+        def _d(s): 
+            try: return date.fromisoformat(s) if s else date.today()
+            except: return date.today()
+        gi,gr,si,sr=None,None,None,None
+        for row in r:
+            if row[0]==wid: gi,gr,si,sr=row[4],row[5],row[6],row[7]; break
+        c1,c2=st.columns(2)
+        with c1:
+            st.markdown("**Gloves**")
+            gi_blank=st.checkbox("Vacío (entrega)", value=(gi is None), key="gi_blank")
+            gi_date=st.date_input("Fecha entrega Gloves", value=_d(gi))
+            gr_blank=st.checkbox("Vacío (devolución)", value=(gr is None), key="gr_blank")
+            gr_date=st.date_input("Fecha devolución Gloves", value=_d(gr))
+        with c2:
+            st.markdown("**Sleeves**")
+            si_blank=st.checkbox("Vacío (entrega)", value=(si is None), key="si_blank")
+            si_date=st.date_input("Fecha entrega Sleeves", value=_d(si))
+            sr_blank=st.checkbox("Vacío (devolución)", value=(sr is None), key="sr_blank")
+            sr_date=st.date_input("Fecha devolución Sleeves", value=_d(sr))
+        if st.button("Guardar cambios PPE"):
+            exec_sql("""UPDATE workers SET
+                        gloves_issued_date=?, gloves_returned_date=?,
+                        sleeves_issued_date=?, sleeves_returned_date=?
+                        WHERE id=?""",
+                     (None if gi_blank else str(gi_date),
+                      None if gr_blank else str(gr_date),
+                      None if si_blank else str(si_date),
+                      None if sr_blank else str(sr_date),
+                      wid))
+            st.success("PPE actualizado.")
+        with db.conn(ppe_balance.SNAPSHOT_TABLES) as cx: _, mm = ppe_balance.mismatches(cx, ppe_balance.current(cx), wid)
+        if mm: st.warning("No coincide con PPE Movimientos: "+"; ".join(f"{x[2]}: ficha {x[3]}, movimientos {x[4]} ({x[5]:g})" for x in mm))
@@ -0,0 +1,24 @@
+"""PPE pendientes x cuadrilla: outstanding PPE per crew, computed from ppe_events."""
+import streamlit as st
+from datetime import date
+import db, ppe_balance
+from db import to_dicts
+from views.common import company_select, crews_for_company
+
+def render():
+    st.subheader("PPE pendientes por cuadrilla (según movimientos)")
+    cid=company_select("Compañía (opcional)",key="ppe_out_comp")
+    crews=crews_for_company(cid) if cid>0 else []
+    crew=st.selectbox("Cuadrilla",["(todas)"]+[x[1] for x in crews])
+    crew_id=None if crew=="(todas)" else crews[[x[1] for x in crews].index(crew)][0]
+    al_dia=st.checkbox("Saldo a una fecha", value=False)
+    upto=st.date_input("Hasta",value=date.today()) if al_dia else None
+    with db.conn(ppe_balance.SNAPSHOT_TABLES) as cx:
+        bal=ppe_balance.balances(cx,end=str(upto)) if al_dia else ppe_balance.current(cx)
+        c,r=ppe_balance.crew_outstanding(cx,bal,[crew_id] if crew_id else [x[0] for x in crews] if cid>0 else None)
+        mc,mm=ppe_balance.mismatches(cx,bal)
+    if r: st.dataframe(to_dicts(c,r),use_container_width=True)
+    else: st.info("Sin PPE pendiente.")
+    with st.expander(f"Diferencias con los campos fijos de trabajadores ({len(mm)})"):
+        if mm: st.dataframe(to_dicts(mc,mm),use_container_width=True)
+        else: st.caption("Los campos fijos coinciden con los movimientos.")
@@ -0,0 +1,18 @@
+"""Sick Hours (Registro): record sick hours for one worker."""
+import streamlit as st
+from datetime import date
+import search
+from db import exec_sql
+
+def render():
+    st.subheader("Registrar horas de enfermedad")
+    s=st.text_input("Buscar trabajador",value="")
+    c,r=search.find_workers(s)
+    opts=[f"{x[0]} — {x[1]} ({x[2]}/{x[3]})" for x in r]
+    sel=st.selectbox("Trabajador",opts) if opts else None; wid=int(sel.split(" — ")[0]) if sel else None
+    a,b,cx=st.columns(3)
+    with a: d=st.date_input("Fecha", value=date.today())
+    with b: h=st.number_input("Horas", min_value=0.0, step=0.5, value=8.0, format="%.1f")
+    with cx: notes=st.text_input("Notas (opcional)")
+    if st.button("➕ Guardar", disabled=(wid is None)):
+        exec_sql("INSERT INTO sick_hours(worker_id,sick_date,hours,notes) VALUES(?,?,?,?)",(wid,str(d),float(h),notes.strip() or None)); st.success("Registro guardado.")
@@ -0,0 +1,18 @@
+"""Historial Sick Hours: paged history, per-worker totals and CSV download."""
+import streamlit as st
+from datetime import date
+import db, queries, search
+from db import q, csv_bytes
+from views.common import paged_history, csv_download
+
+def render():
+    st.subheader("Historial de sick hours")
+    s=st.text_input("Buscar (nombre contiene)",value="")
+    d1,d2=st.columns(2); f=d1.date_input("Desde",value=date(2025,1,1)); t=d2.date_input("Hasta",value=date.today())
+    sel,where,count_from,order,totals=queries.HISTORY["sick"]; p=[str(f),str(t)]
+    fs,fp=search.worker_filter(s); where+=fs; p+=fp
+    n=paged_history("sick",sel,where,p,order,count_from)
+    totals=q(totals.format(where=where),tuple(p),arrow=True)
+    st.dataframe(totals,use_container_width=True)
+    if n: csv_download("CSV historial", db.keyset_sql(sel,where,order,limit=False), p, "sick_historial", "sick")
+    if totals.num_rows: st.download_button("CSV totales", data=csv_bytes(totals), file_name="sick_totales.csv", mime="text/csv")
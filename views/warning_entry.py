@@ -0,0 +1,18 @@
+"""Warnings: record a warning."""
+import streamlit as st
+from datetime import date
+import search
+from db import exec_sql
+
+def render():
+    st.subheader("Registrar Warning")
+    s=st.text_input("Buscar trabajador",value="")
+    c,r=search.find_workers(s)
+    opts=[f"{x[0]} — {x[1]} ({x[2]}/{x[3]})" for x in r]
+    sel=st.selectbox("Trabajador",opts) if opts else None; wid=int(sel.split(" — ")[0]) if sel else None
+    a,b,cx=st.columns(3)
+    with a: d=st.date_input("Fecha", value=date.today())
+    with b: t=st.selectbox("Tipo",["no_safety_glasses","low_production","other"])
+    with cx: notes=st.text_input("Notas (opcional)")
+    if st.button("➕ Guardar warning", disabled=(wid is None)):
+        exec_sql("INSERT INTO warnings(worker_id,warn_date,warn_type,notes) VALUES(?,?,?,?)",(wid,str(d),t,notes.strip() or None)); st.success("Guardado.")
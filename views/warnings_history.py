@@ -0,0 +1,16 @@
+"""Historial Warnings: paged history and per-worker totals."""
+import streamlit as st
+from datetime import date
+import db, queries, search
+from db import q
+from views.common import paged_history, csv_download
+
+def render():
+    st.subheader("Historial Warnings")
+    s=st.text_input("Buscar (nombre contiene)",value=""); d1,d2=st.columns(2); fd=d1.date_input("Desde",value=date(2025,1,1)); td=d2.date_input("Hasta",value=date.today())
+    sel,where,count_from,order,totals=queries.HISTORY["warn"]; p=[str(fd),str(td)]
+    fs,fp=search.worker_filter(s); where+=fs; p+=fp
+    n=paged_history("warn",sel,where,p,order,count_from)
+    totals=q(totals.format(where=where),tuple(p),arrow=True)
+    st.dataframe(totals,use_container_width=True)
+    if n: csv_download("CSV Warnings", db.keyset_sql(sel,where,order,limit=False), p, "warnings_historial", "warn")
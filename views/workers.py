@@ -0,0 +1,53 @@
+"""Trabajadores (Alta/Edición): hire, edit, terminate and delete workers."""
+import streamlit as st
+from datetime import date
+import search, operations
+from db import q, exec_sql, to_dicts
+from views.common import company_select, crews_for_company
+
+def render():
+    st.subheader("Alta de trabajador")
+    cid=company_select("Compañía del trabajador", key="comp_worker")
+    crews=crews_for_company(cid)
+    if cid<=0:
+        st.info("Selecciona compañía para ver cuadrillas."); crew_id=-1
+    else:
+        opts=["— seleccionar —"]+[f"{r[1]} — {r[2] or ''}" for r in crews]
+        sel=st.selectbox("Cuadrilla",opts, key="crew_sel")
+        crew_id=-1 if sel=="— seleccionar —" else crews[opts.index(sel)-1][0]
+    name=st.text_input("Nombre completo")
+    start=st.date_input("Fecha de alta", value=date.today())
+    g_chk=st.checkbox("Registrar entrega de Gloves ahora"); g_date=st.date_input("Fecha Gloves", value=date.today(), key="g_issue")
+    s_chk=st.checkbox("Registrar entrega de Sleeves ahora"); s_date=st.date_input("Fecha Sleeves", value=date.today(), key="s_issue")
+    if st.button("💾 Guardar trabajador"):
+        if cid<=0 or crew_id<=0 or not name.strip(): st.warning("Faltan datos."); 
+        else:
+            exec_sql("""INSERT INTO workers(full_name,company_id,crew_id,start_date,gloves_issued_date,sleeves_issued_date,active)
+                        VALUES(?,?,?,?,?,?,1)""",
+                     (name.strip(),cid,crew_id,str(start),str(g_date) if g_chk else None,str(s_date) if s_chk else None))
+            st.success("Guardado.")
+
+    st.markdown("---"); st.subheader("Editar / Baja / Borrar")
+    s=st.text_input("Buscar (nombre contiene)",value="")
+    c,r=search.find_workers(s, cols="w.id,w.full_name,c.name company,cr.crew_code crew,w.start_date,w.termination_date,w.active",
+                            limit=200, order="w.id DESC")
+    rows=to_dicts(c,r); st.dataframe(rows,use_container_width=True)
+    if rows:
+        sel_id=st.selectbox("ID trabajador",[x["id"] for x in rows])
+        c2,r2=q("SELECT id,full_name,start_date,termination_date,active,notes FROM workers WHERE id=?",(sel_id,)); w2=to_dicts(c2,r2)[0]
+        a,b,cx=st.columns(3)
+        with a: new_name=st.text_input("Nombre",value=w2["full_name"])
+        with b: new_start=st.date_input("Alta", value=date.fromisoformat(w2["start_date"]) if w2["start_date"] else date.today())
+        with cx: new_active=st.checkbox("Activo", value=bool(w2["active"]))
+        notes=st.text_input("Notas", value=w2["notes"] or "")
+        if st.button("✅ Actualizar"):
+            exec_sql("UPDATE workers SET full_name=?,start_date=?,notes=?,active=? WHERE id=?",(new_name.strip(),str(new_start),notes.strip() or None,1 if new_active else 0,sel_id)); st.success("Actualizado.")
+        st.error("Zona peligrosa")
+        col1,col2=st.columns(2)
+        if col1.button("✋ Dar de baja (no borrar)"):
+            exec_sql("UPDATE workers SET active=0,termination_date=? WHERE id=?",(str(date.today()),sel_id)); st.success("Baja aplicada."); st.rerun()
+        conf=st.text_input("Escribe BORRAR para eliminar", key=f"conf_{sel_id}")
+        if col2.button("🗑️ Borrar trabajador + historial"):
+            if conf.strip().upper()=="BORRAR":
+                operations.delete_worker(sel_id); st.success("Eliminado."); st.rerun()
+            else: st.warning("Confirmación incorrecta.")
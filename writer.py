@@ -0,0 +1,103 @@
+"""Single writer thread: every exec_sql() from every session goes through it.
+
+Whatever queued up while the previous batch was committing (plus anything
+arriving within WINDOW seconds) is committed together in one BEGIN IMMEDIATE
+transaction. The batch runs without savepoints first; if a statement fails
+(e.g. a UNIQUE violation) the batch is rolled back and redone with a
+SAVEPOINT per statement, so only the failing one is rejected and reported to
+its own caller. When the database is busy or locked the whole batch is
+retried with exponential backoff. Callers block on a Future and get the row
+count back, or the statement's own exception raised in their thread.
+"""
+import queue, random, sqlite3, threading, time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+import db
+
+WINDOW = 0           # extra seconds to wait for more statements before committing
+MAX_BATCH = 500
+RETRIES = 6
+BACKOFF = 0.01       # first retry delay in seconds; doubles each time, with jitter
+BUSY_TIMEOUT = 0.1   # seconds SQLite itself waits per attempt; the backoff does the rest
+TIMEOUT = 15.0       # seconds wait() gives a queued statement before giving up on it
+
+_q = queue.Queue()
+_thread = None
+_start = threading.Lock()
+stats = {"batches": 0, "statements": 0, "retries": 0, "failed": 0}   # updated by the writer thread only
+
+def busy(e):
+    return isinstance(e, sqlite3.OperationalError) and ("locked" in str(e) or "busy" in str(e))
+
+def submit(sql, p=()):
+    """Queue one write; returns a Future resolving to its row count."""
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        with _start:
+            if _thread is None or not _thread.is_alive():
+                _thread = threading.Thread(target=_run, name="db-writer", daemon=True); _thread.start()
+    f = Future(); _q.put((sql, tuple(p), f))
+    return f
+
+def wait(f, timeout=None):
+    """Result of a submitted Future. If it is still queued after `timeout`
+    (default TIMEOUT) it is withdrawn and "database is locked" is raised, so
+    the statement can no longer run behind the caller's back."""
+    try: return f.result(TIMEOUT if timeout is None else timeout)
+    except FutureTimeout:
+        if f.cancel():
+            raise sqlite3.OperationalError("database is locked (la base está ocupada; intenta de nuevo)") from None
+        return f.result()   # already being committed: retries are bounded
+
+def _run():
+    while True:
+        batch = [_q.get()]
+        end = time.monotonic() + WINDOW
+        while len(batch) < MAX_BATCH:
+            left = end - time.monotonic()
+            try: batch.append(_q.get(timeout=left) if left > 0 else _q.get_nowait())
+            except queue.Empty: break
+        batch = [x for x in batch if x[2].set_running_or_notify_cancel()]   # drop withdrawn ones
+        if batch: _commit(batch)
+
+def _apply(c, batch, guarded):
+    results = []
+    for sql, p, _ in batch:
+        if not guarded:
+            results.append(c.execute(sql, p).rowcount); continue
+        c.execute("SAVEPOINT w")
+        try:
+            results.append(c.execute(sql, p).rowcount); c.execute("RELEASE w")
+        except sqlite3.Error as e:
+            if busy(e): raise
+            c.execute("ROLLBACK TO w"); c.execute("RELEASE w"); results.append(e)
+    return results
+
+def _commit(batch):
+    tables = set()
+    for sql, _, _ in batch: tables |= db.tables_written(sql)
+    # First try without savepoints (one execute per statement keeps the
+    # thread's GIL handoffs down); if a statement fails, redo the batch with
+    # one savepoint per statement so only that one is rejected.
+    guarded, attempt = False, 0
+    while True:
+        try:
+            with db.conn(tables) as c:
+                c.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+                try:
+                    c.execute("BEGIN IMMEDIATE")
+                    results = _apply(c, batch, guarded)
+                finally: c.execute(f"PRAGMA busy_timeout={int(db.BUSY_TIMEOUT * 1000)}")   # back to the pool default
+            break
+        except BaseException as e:
+            if busy(e) and attempt < RETRIES:
+                stats["retries"] += 1
+                time.sleep(BACKOFF * 2 ** attempt * (1 + random.random())); attempt += 1; continue
+            if not guarded and len(batch) > 1 and isinstance(e, sqlite3.Error) and not busy(e):
+                guarded = True; continue
+            stats["failed"] += len(batch)
+            for _, _, f in batch: f.set_exception(e)
+            return
+    stats["batches"] += 1; stats["statements"] += len(batch)
+    for (_, _, f), r in zip(batch, results):
+        if isinstance(r, Exception): f.set_exception(r); stats["failed"] += 1
+        else: f.set_result(r)